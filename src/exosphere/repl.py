@@ -9,6 +9,7 @@ maintaining Rich output formatting.
 import logging
 import shlex
 import sys
+from collections import OrderedDict
 from collections.abc import Callable, Iterable, Iterator
 from typing import get_args
 
@@ -17,9 +18,9 @@ from prompt_toolkit import prompt
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.document import Document
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.history import FileHistory, History
+from prompt_toolkit.history import FileHistory, History, InMemoryHistory
 from prompt_toolkit.shortcuts import CompleteStyle
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 
 from exosphere import app_config
@@ -29,7 +30,13 @@ from exosphere.objects import Host
 logger = logging.getLogger(__name__)
 
 # Common help flags, will be stripped before resolving a command chain
-_HELP_FLAGS = {"--help"}
+_HELP_FLAGS = frozenset({"--help"})
+
+# Ways of asking 'help' about itself
+_HELP_SELF = frozenset({"help", *_HELP_FLAGS})
+
+# Maximum number of completion results memoized by the completer
+_COMPLETION_CACHE_SIZE = 256
 
 # Builtin (REPL-only) commands, mostly for help.
 BUILTINS = {
@@ -92,6 +99,38 @@ def _trim_history_file(path: str, max_entries: int) -> None:
         logger.warning("Could not rewrite trimmed history file: %s", e)
 
 
+class _LazyFileHistory(FileHistory):
+    """
+    FileHistory that defers all disk access until first use
+
+    Trimming the history file is postponed until history is first
+    loaded (at the first prompt), so constructing the REPL never
+    touches the disk.
+
+    I/O errors while reading or writing the file are logged and
+    swallowed, degrading to in-memory history for the session instead
+    of crashing the prompt.
+    """
+
+    def __init__(self, filename: str, max_entries: int) -> None:
+        super().__init__(filename)
+        self.max_entries = max_entries
+
+    def load_history_strings(self) -> Iterable[str]:
+        _trim_history_file(str(self.filename), self.max_entries)
+        try:
+            return list(super().load_history_strings())
+        except OSError as e:
+            logger.warning("Could not load history file: %s", e)
+            return []
+
+    def store_string(self, string: str) -> None:
+        try:
+            super().store_string(string)
+        except OSError as e:
+            logger.warning("Could not write to history file: %s", e)
+
+
 def _accepts_host(argument) -> bool:
     """
     Check if argument resolves host names.
@@ -114,6 +153,59 @@ def _subcommands(app: App) -> list[str]:
     return [name for name in app if not name.startswith("-")]
 
 
+class _Trie:
+    """
+    Minimal prefix trie over a fixed set of words
+
+    Nested dicts keyed by character, with the complete word stored
+    under an empty-string sentinel key at its terminal node. Lookups
+    walk the prefix once, then collect everything below that node.
+
+    Words come back sorted, since the sentinel sorts before any
+    character, which is exactly what the completion listing expects.
+    """
+
+    _END = ""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self._root: dict = {}
+        self._size = 0
+
+        for word in words:
+            node = self._root
+            for char in word:
+                node = node.setdefault(char, {})
+            if self._END not in node:
+                node[self._END] = word
+                self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """
+        Return all words starting with prefix, in sorted order.
+
+        :param prefix: The prefix to look up
+        """
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        words: list[str] = []
+        self._collect(node, words)
+        return words
+
+    def _collect(self, node: dict, words: list[str]) -> None:
+        for key in sorted(node):
+            if key == self._END:
+                words.append(node[key])
+            else:
+                self._collect(node[key], words)
+
+
 class ExosphereCompleter(Completer):
     """
     Readline-like completion for Exosphere commands
@@ -123,7 +215,7 @@ class ExosphereCompleter(Completer):
     builtin REPL commands (e.g. 'help', 'exit', etc).
     """
 
-    def __init__(self, app: App, host_names: Callable[[], list[str]]) -> None:
+    def __init__(self, app: App, host_names: Callable[[], Iterable[str]]) -> None:
         self.app = app
         self.host_names = host_names
 
@@ -132,6 +224,28 @@ class ExosphereCompleter(Completer):
         # it per command node instead of re-introspecting every keystroke
         self._ac_cache: dict[int, ArgumentCollection] = {}
 
+        # Same deal for subcommand names, which are walked on nearly
+        # every keystroke, and the top-level candidates (with builtins).
+        # These are kept as prefix tries so lookups don't scan them all.
+        self._subs_cache: dict[int, _Trie] = {}
+        self._top_level = _Trie([*_subcommands(app), *BUILTINS])
+
+        # Long option names per leaf command, also invariant
+        self._opts_cache: dict[int, tuple[str, ...]] = {}
+
+        # Host names can change under us (inventory reloads), so that
+        # trie is rebuilt whenever the list of names differs, and the
+        # version is bumped to invalidate memoized completions.
+        self._host_names: tuple[str, ...] = ()
+        self._host_trie = _Trie(())
+        self._host_version = 0
+
+        # prompt_toolkit asks again for the same line on redraws, so we
+        # memoize results per (line, host version), with LRU eviction.
+        self._cache: OrderedDict[tuple[str, int], tuple[Completion, ...]] = (
+            OrderedDict()
+        )
+
     def _argument_collection(self, node: App) -> ArgumentCollection:
         """
         Returns the argument collection for a command node.
@@ -144,6 +258,34 @@ class ExosphereCompleter(Completer):
 
         return self._ac_cache[key]
 
+    def _subcommands(self, node: App) -> _Trie:
+        """
+        Returns the subcommand names of a command node, as a prefix trie.
+        Caches the result for performance.
+        """
+        key = id(node)
+
+        if key not in self._subs_cache:
+            self._subs_cache[key] = _Trie(_subcommands(node))
+
+        return self._subs_cache[key]
+
+    def _long_options(self, node: App, ac: ArgumentCollection) -> tuple[str, ...]:
+        """
+        Returns the long option names of a leaf command, including --help.
+        Caches the result for performance.
+        """
+        key = id(node)
+
+        if key not in self._opts_cache:
+            # We only complete long options, for discoverability
+            self._opts_cache[key] = (
+                "--help",
+                *(name for arg in ac for name in arg.names if name.startswith("--")),
+            )
+
+        return self._opts_cache[key]
+
     def _complete(self, matches: Iterable[str], prefix: str) -> Iterator[Completion]:
         """
         Yield completions for matches with the given prefix.
@@ -152,7 +294,27 @@ class ExosphereCompleter(Completer):
         an ancestral behavior from Quality Things like Bash that I, for
         one, absolutely expect. A time tried tradition.
         """
-        candidates = sorted(m for m in set(matches) if m.startswith(prefix))
+        yield from self._emit(
+            sorted({m for m in matches if m.startswith(prefix)}), prefix
+        )
+
+    def _complete_trie(
+        self, trie: _Trie, prefix: str, exclude: set[str] | None = None
+    ) -> Iterator[Completion]:
+        """
+        Yield completions for words of a prefix trie with the given prefix.
+
+        Same as :meth:`_complete`, without scanning every candidate.
+        """
+        candidates = trie.with_prefix(prefix)
+        if exclude:
+            candidates = [c for c in candidates if c not in exclude]
+        yield from self._emit(candidates, prefix)
+
+    def _emit(self, candidates: list[str], prefix: str) -> Iterator[Completion]:
+        """
+        Yield completions for sorted, unique candidates matching prefix.
+        """
         startpos = -len(prefix)
 
         if len(candidates) == 1:
@@ -172,9 +334,17 @@ class ExosphereCompleter(Completer):
         hosts that have already been consumed/completed in the current
         command line.
         """
-        exclude = exclude or set()
-        hosts = [h for h in self.host_names() if h not in exclude]
-        yield from self._complete(hosts, prefix)
+        yield from self._complete_trie(self._host_trie, prefix, exclude)
+
+    def _refresh_hosts(self) -> None:
+        """
+        Rebuild the host trie if the host names have changed.
+        """
+        names = tuple(self.host_names())
+        if names is not self._host_names and names != self._host_names:
+            self._host_names = names
+            self._host_trie = _Trie(names)
+            self._host_version += 1
 
     def get_completions(
         self, document: Document, complete_event
@@ -183,11 +353,32 @@ class ExosphereCompleter(Completer):
         Retrieve completion based on current input
 
         Provides the main completer logic for Exosphere commands.
+        Results are memoized per input line and host names.
 
         :param document: The current input document
         :param complete_event: The completion event (not used here)
         """
         text = document.text_before_cursor
+        self._refresh_hosts()
+        key = (text, self._host_version)
+
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = tuple(self._completions(text))
+            self._cache[key] = cached
+            if len(self._cache) > _COMPLETION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+
+        yield from cached
+
+    def _completions(self, text: str) -> Iterator[Completion]:
+        """
+        Compute completions for the text before the cursor.
+
+        :param text: The input line, up to the cursor
+        """
         words = text.split()
         ends_space = text == "" or text.endswith(" ")
         current = "" if ends_space else (words[-1] if words else "")
@@ -195,18 +386,18 @@ class ExosphereCompleter(Completer):
 
         # Complete top-level commands and builtins
         if not settled:
-            yield from self._complete(_subcommands(self.app) + list(BUILTINS), current)
+            yield from self._complete_trie(self._top_level, current)
             return
 
         head = settled[0]
 
         # Handle built-in commands
         # Only 'help' completes commands, others take no arguments
-        if head in ("exit", "quit", "clear"):
+        if head in BUILTINS:
             return
         if head == "help":
             if len(settled) == 1:
-                yield from self._complete(_subcommands(self.app), current)
+                yield from self._complete_trie(self._subcommands(self.app), current)
             return
 
         # Resolve the command chain
@@ -214,9 +405,9 @@ class ExosphereCompleter(Completer):
         node = apps[-1]
 
         # Complete group subcommands
-        subs = _subcommands(node)
+        subs = self._subcommands(node)
         if subs and not unused:
-            yield from self._complete(subs, current)
+            yield from self._complete_trie(subs, current)
             return
 
         # Introspect command arguments for leaf commands
@@ -226,14 +417,10 @@ class ExosphereCompleter(Completer):
         except Exception:  # noqa: BLE001
             return
 
-        used_opts = {token for token in unused if token.startswith("-")}
-
         # Completing an option name.
         if current.startswith("-"):
-            opts = ["--help"]
-            for arg in ac:
-                # We only complete long options, for discoverability
-                opts.extend(name for name in arg.names if name.startswith("--"))
+            used_opts = {token for token in unused if token.startswith("-")}
+            opts = self._long_options(node, ac)
             yield from self._complete(
                 (opt for opt in opts if opt not in used_opts), current
             )
@@ -303,6 +490,14 @@ class ExosphereREPL:
         self.console = Console()
         self.builtins = BUILTINS
 
+        # Handlers for builtin commands, called with remaining arguments
+        self._builtin_handlers: dict[str, Callable[[list[str]], None]] = {
+            "exit": self._exit,
+            "quit": self._exit,
+            "clear": self._clear,
+            "help": self._show_help,
+        }
+
         # Reveal interactive-only (hidden) commands
         # We keep these hidden from normal CLI help since they only
         # make sense across multiple commands (e.g. 'connections')
@@ -311,14 +506,39 @@ class ExosphereREPL:
         # Setup persistent history
         self.history = self._setup_history()
 
+        # Snapshot of inventory host names for completion, refreshed
+        # when the inventory's host list is replaced or resized.
+        self._hosts_src: list[Host] | None = None
+        self._hosts_len = 0
+        self._host_names_snapshot: tuple[str, ...] = ()
+
         # Setup the specialized completer
         self.completer = ExosphereCompleter(app, self._host_names)
 
-    def _host_names(self) -> list[str]:
-        """Host names from the current inventory (for completion)."""
+        # General help panel, built on first use since the command
+        # tree doesn't change during the session.
+        self._help_panel: Panel | None = None
+
+    def _host_names(self) -> tuple[str, ...]:
+        """
+        Host names from the current inventory (for completion).
+
+        The names are snapshotted and only re-read when the inventory's
+        host list is a different object or has changed length, instead
+        of walking every host on each keystroke.
+        """
         if app_context.inventory is None:
-            return []
-        return [host.name for host in app_context.inventory.hosts]
+            self._hosts_src = None
+            self._host_names_snapshot = ()
+            return self._host_names_snapshot
+
+        hosts = app_context.inventory.hosts
+        if hosts is not self._hosts_src or len(hosts) != self._hosts_len:
+            self._hosts_src = hosts
+            self._hosts_len = len(hosts)
+            self._host_names_snapshot = tuple(host.name for host in hosts)
+
+        return self._host_names_snapshot
 
     def _setup_history(self) -> History:
         """
@@ -327,23 +547,20 @@ class ExosphereREPL:
         The history file will be dumped in the State directory for
         Exosphere, according to platform conventions.
 
-        Before opening, the file is trimmed to the most recent
-        ``history_max_entries`` entries so it cannot grow without bound.
+        The file is only opened when history is first loaded, at which
+        point it is trimmed to the most recent ``history_max_entries``
+        entries so it cannot grow without bound.
 
-        Falls back to in-memory history if the file cannot be opened.
+        Falls back to in-memory history if it cannot be setup.
         """
         try:
-            history_file = str(app_config["options"]["history_file"])
-            _trim_history_file(
-                history_file, app_config["options"]["history_max_entries"]
+            return _LazyFileHistory(
+                str(app_config["options"]["history_file"]),
+                app_config["options"]["history_max_entries"],
             )
-            return FileHistory(history_file)
         except Exception as e:  # noqa: BLE001
             logger.warning("Could not setup persistent history: %s", e)
             logger.warning("REPL is falling back to in-memory history")
-
-            from prompt_toolkit.history import InMemoryHistory
-
             return InMemoryHistory()
 
     def cmdloop(self, intro: str | None = None) -> None:
@@ -400,22 +617,18 @@ class ExosphereREPL:
         """
         Parse and Execute a command with Rich output formatting
         """
+        # Blank lines are a no-op, no need to tokenize them
+        if not line or line.isspace():
+            return
+
         try:
             # Split the command line into arguments
             args = shlex.split(line)
-            if not args:
-                return
-
-            command = args[0]
 
             # Handle built-in commands
-            if command in ("exit", "quit"):
-                raise EOFError
-            elif command == "help":
-                self._show_help(args[1:])
-                return
-            elif command == "clear":
-                self.console.clear()
+            handler = self._builtin_handlers.get(args[0])
+            if handler is not None:
+                handler(args[1:])
                 return
 
             # Execute application commands
@@ -431,6 +644,18 @@ class ExosphereREPL:
             self.console.print(f"[red]Error executing command: {e}[/red]")
             logger.exception("Error executing command: %s", line)
 
+    def _exit(self, args: list[str]) -> None:
+        """
+        Leave the REPL, by signaling EOF to the main loop
+        """
+        raise EOFError
+
+    def _clear(self, args: list[str]) -> None:
+        """
+        Clear the console
+        """
+        self.console.clear()
+
     def _execute_command(self, args: list[str]) -> None:
         """
         Dispatch and Execute an Application command
@@ -530,7 +755,7 @@ class ExosphereREPL:
         elif args[0] in self.builtins:
             # Handle built-in commands
             self.console.print(f"[cyan]Built-in: {self.builtins[args[0]]}[/cyan]")
-        elif args[0] in ("--help", "help"):
+        elif args[0] in _HELP_SELF:
             # Show help for help, because someone is bound to try
             # Might as well leave a small easter egg for them.
             self.console.print(
@@ -544,10 +769,12 @@ class ExosphereREPL:
             if not self._scoped_help([args[0], "--help"]):
                 self._execute_command([args[0]])
 
-    def _show_general_help(self) -> None:
+    def _build_help_panel(self) -> Panel | None:
         """
-        Show general help for interactive mode
+        Build the panel listing available commands for general help
         Hidden commands will be included.
+
+        Returns None if there are no commands to list.
         """
         lines = []
         for name in _subcommands(self.app):
@@ -560,26 +787,47 @@ class ExosphereREPL:
 
             lines.append(f"[cyan]{name:<13}[/cyan] {first_line}")
 
-        if lines:
-            panel = Panel.fit(
-                "\n".join(lines),
-                title="Commands",
-                title_align="left",
-                border_style="dim",
-            )
-            self.console.print("\nAvailable commands during interactive use:\n")
-            self.console.print(panel)
-
-        # Spacing for better readability
-        self.console.print()
+        if not lines:
+            return None
 
-        self.console.print(
-            "Use '<command> --help' or 'help <command>' for help on a specific command."
+        return Panel.fit(
+            "\n".join(lines),
+            title="Commands",
+            title_align="left",
+            border_style="dim",
         )
 
-        self.console.print(
-            f"[dim]Built-in commands: {', '.join(self.builtins.keys())}[/dim]"
-        )
+    def _invalidate_help_panel(self) -> None:
+        """
+        Discard the cached general help panel, so it is rebuilt on next use.
+        Call this if commands are ever added or removed at runtime.
+        """
+        self._help_panel = None
+
+    def _show_general_help(self) -> None:
+        """
+        Show general help for interactive mode
+        Hidden commands will be included.
+        """
+        if self._help_panel is None:
+            self._help_panel = self._build_help_panel()
+
+        # Everything is grouped and rendered in a single print call
+        parts: list[RenderableType] = []
+
+        if self._help_panel is not None:
+            parts += [
+                "\nAvailable commands during interactive use:\n",
+                self._help_panel,
+            ]
+
+        parts += [
+            "",  # Spacing for better readability
+            "Use '<command> --help' or 'help <command>' for help on a specific command.",
+            f"[dim]Built-in commands: {', '.join(self.builtins.keys())}[/dim]",
+        ]
+
+        self.console.print(Group(*parts))
 
 
 def _unhide(app: App) -> None:
@@ -7,13 +7,16 @@ using Jinja2 templates.
 
 import json
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any
 
 import jinja2
+from jinja2.bccache import Bucket
 
-from exosphere import __version__
+from exosphere import __version__, fspaths
+from exosphere.data import Update
 from exosphere.objects import Host
 
 logger: logging.Logger = logging.getLogger(__name__)
@@ -43,6 +46,112 @@ class OutputFormat(str, Enum):
     json = "json"
 
 
+@dataclass(frozen=True)
+class HostUpdates:
+    """
+    Updates of a single host, partitioned once per render.
+
+    Templates look up a host's security and regular updates in several
+    places (navigation, host sections, summaries), so they are split in
+    a single pass over the host's updates instead of on every lookup.
+    """
+
+    updates: list[Update]
+    security: list[Update]
+    regular: list[Update]
+
+    @classmethod
+    def from_host(cls, host: Host) -> "HostUpdates":
+        """
+        Partition the updates of the given host.
+
+        :param host: Host object included in the report
+        :return: HostUpdates instance
+        """
+        security: list[Update] = []
+        regular: list[Update] = []
+        for update in host.updates:
+            (security if update.security else regular).append(update)
+
+        return cls(updates=host.updates, security=security, regular=regular)
+
+    def for_report(self, report_type: ReportType) -> list[Update]:
+        """
+        Get the updates listed for the host in the given report type.
+
+        :param report_type: Type of report (full, updates only, security only)
+        :return: Security updates for security reports, all updates otherwise
+        """
+        if report_type == ReportType.security_only:
+            return self.security
+
+        return self.updates
+
+
+@dataclass(frozen=True)
+class ReportSummary:
+    """
+    Summary statistics for a report, computed in a single pass.
+
+    Templates display these counts in their summary section, and would
+    otherwise have to walk every host's updates once per statistic.
+    """
+
+    hosts_with_updates: int
+    hosts_with_security_updates: int
+    total_updates: int
+    total_security_updates: int
+
+    @classmethod
+    def from_host_updates(cls, host_updates: list[HostUpdates]) -> "ReportSummary":
+        """
+        Compute summary statistics from partitioned host updates.
+
+        :param host_updates: Partitioned updates of each host in the report
+        :return: ReportSummary instance
+        """
+        hosts_with_updates = hosts_with_security = 0
+        total_updates = total_security = 0
+
+        for partition in host_updates:
+            updates = len(partition.updates)
+            security = len(partition.security)
+
+            hosts_with_updates += bool(updates)
+            hosts_with_security += bool(security)
+            total_updates += updates
+            total_security += security
+
+        return cls(
+            hosts_with_updates=hosts_with_updates,
+            hosts_with_security_updates=hosts_with_security,
+            total_updates=total_updates,
+            total_security_updates=total_security,
+        )
+
+
+class _BytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    Filesystem bytecode cache that never fails a render.
+
+    Jinja lets I/O errors from the cache directory propagate, which would
+    make a read-only or full cache directory break every report. Errors
+    are logged and the template is compiled in memory instead.
+    """
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().load_bytecode(bucket)
+        except OSError as e:
+            logger.debug("Could not load cached template bytecode: %s", e)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            logger.debug("Could not write cached template bytecode: %s", e)
+
+
 class ReportRenderer:
     """
     Renders reports in various formats using Jinja2 templates.
@@ -58,25 +167,63 @@ class ReportRenderer:
         self.env = self.setup_jinja_environment(text=False)
         self.text_env = self.setup_jinja_environment(text=True)
 
+    def setup_bytecode_cache(self, text: bool) -> jinja2.BytecodeCache | None:
+        """
+        Setup a persistent bytecode cache for compiled templates.
+
+        Compiled templates are stored under the Exosphere cache directory,
+        so subsequent runs can skip parsing and compiling them entirely.
+
+        Jinja only keys entries on template name and source, while the
+        compiled code also depends on environment options such as
+        autoescaping and whitespace control. Each Exosphere version and
+        environment therefore gets its own cache directory.
+
+        The cache is optional: if the directory cannot be created, it is
+        disabled, and errors reading or writing entries are ignored.
+        Templates are then simply compiled on every run.
+
+        :param text: Whether the cache is for the text environment
+        :return: Bytecode cache, or None if unavailable
+        """
+        cache_dir = fspaths.CACHE_DIR / "templates" / __version__
+        cache_dir /= "text" if text else "html"
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.debug("Template bytecode cache unavailable: %s", e)
+            return None
+
+        return _BytecodeCache(str(cache_dir))
+
     def setup_jinja_environment(self, text: bool) -> jinja2.Environment:
         """
         Setup Jinja2 environment with templates from the package.
 
         Configures autoescaping, global functions, and custom filters.
 
-        :param text: Turns on trim_blocks and lstrip_blocks for text templates
+        :param text: Turns on trim_blocks and lstrip_blocks for text templates,
+            and disables autoescaping, which only applies to markup
         :return: Configured Jinja2 Environment
         """
         logger.debug("Setting up reporting environment")
 
         # Setup loader using PackageLoader for the module's namespace
         # This implies templates can be found under the "templates" directory
+        # Templates are package data and do not change at runtime, so
+        # compiled templates are served from the environment's cache
+        # without checking the source files for changes on every render.
         loader = jinja2.PackageLoader("exosphere")
         env = jinja2.Environment(
             loader=loader,
-            autoescape=jinja2.select_autoescape(["html", "htm", "xml"]),
+            # Templates carry a .j2 suffix, so match on the full extension
+            autoescape=False
+            if text
+            else jinja2.select_autoescape(["html.j2", "htm.j2", "xml.j2"]),
             trim_blocks=text,
             lstrip_blocks=text,
+            bytecode_cache=self.setup_bytecode_cache(text),
+            auto_reload=False,
         )
 
         logger.debug("Setting up utility functions and filters for templates")
@@ -92,6 +239,23 @@ class ReportRenderer:
 
         return env
 
+    def _updates_context(self, hosts: list[Host]) -> dict[str, Any]:
+        """
+        Build the update-related template context for the given hosts.
+
+        Partitions each host's updates once, and derives the report
+        summary from those partitions. Templates look up a host's
+        partition through ``host_updates[loop.index0]``.
+
+        :param hosts: List of Host objects to include in the report
+        :return: Context variables for the template
+        """
+        host_updates = [HostUpdates.from_host(host) for host in hosts]
+        return {
+            "host_updates": host_updates,
+            "summary": ReportSummary.from_host_updates(host_updates),
+        }
+
     def render_markdown(
         self,
         hosts: list[Host],
@@ -121,6 +285,7 @@ class ReportRenderer:
         return template.render(
             hosts=hosts,
             hosts_count=hosts_count,
+            **self._updates_context(hosts),
             report_type=report_type,
             report_scope=report_scope,
             **kwargs,
@@ -155,6 +320,7 @@ class ReportRenderer:
         return template.render(
             hosts=hosts,
             hosts_count=hosts_count,
+            **self._updates_context(hosts),
             report_type=report_type,
             report_scope=report_scope,
             **kwargs,
@@ -192,6 +358,7 @@ class ReportRenderer:
         return template.render(
             hosts=hosts,
             hosts_count=hosts_count,
+            **self._updates_context(hosts),
             report_type=report_type,
             navigation=navigation,
             report_scope=report_scope,
@@ -230,9 +397,9 @@ class ReportRenderer:
         for host in hosts:
             host_dict = host.to_dict()
             if report_type == ReportType.security_only:
-                # Replace 'updates' with security updates only
+                # Keep security updates only, reusing the serialized ones
                 host_dict["updates"] = [
-                    update.__dict__.copy() for update in host.security_updates
+                    update for update in host_dict["updates"] if update["security"]
                 ]
 
             # Elide optional user-provided fields when empty
@@ -6,6 +6,7 @@ ever used for validating output in the test suite.
 """
 
 import json
+from functools import lru_cache
 from pathlib import Path
 
 SCHEMA_DIR = Path(__file__).parent
@@ -26,6 +27,12 @@ def load_schema(name: str) -> dict:
         return json.load(f)
 
 
+@lru_cache(maxsize=1)
 def get_host_report_schema() -> dict:
-    """Get the host report JSON schema."""
+    """
+    Get the host report JSON schema.
+
+    The schema is loaded once and cached, so the same dict is returned
+    on every call. Callers must not modify it.
+    """
     return load_schema("host-report")
@@ -1,13 +1,34 @@
+from pathlib import Path
+
 import pytest
+from fabric import Connection
 
 # Import fixtures from Fabric's suite, for general availability in tests.
 # We also disable linter warnings for unused imports, since they are used elsewhere.
 from fabric.testing.fixtures import connection  # noqa: F401
 from rich.console import Console
 
+from exosphere import fspaths
 from exosphere.commands import utils as utils_module
 from exosphere.objects import Host
 
+# Captured command output used as test data, e.g. package manager listings
+_DATA_DIR = Path(__file__).parent / "data"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_cache_dir(tmp_path_factory):
+    """
+    Point the Exosphere cache directory at a temporary location.
+
+    Anything that persists to the cache directory during tests, such as
+    compiled report templates, would otherwise land in the user's real
+    cache. Tests that need their own directory can still patch it.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(fspaths, "CACHE_DIR", tmp_path_factory.mktemp("cache"))
+        yield fspaths.CACHE_DIR
+
 
 def _make_console(stderr: bool = False) -> Console:
     """
@@ -29,7 +50,7 @@ def _make_console(stderr: bool = False) -> Console:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def rich_console():
     """
     General fixture for constructing a deterministic Rich console
@@ -38,6 +59,7 @@ def rich_console():
     with the same configuration as patch_console.
 
     Fixed width, no colors, disabled special handling.
+    Session-scoped, so broader-scoped fixtures can build consoles too.
     """
     return _make_console
 
@@ -163,3 +185,54 @@ def wire_get_host():
         return inventory
 
     return _wire
+
+
+@pytest.fixture(scope="session")
+def connection_spec():
+    """
+    Session-scoped attribute spec for mock Fabric connections.
+
+    Introspects the ``Connection`` class once, so every mock connection
+    can be restricted to its attributes without walking it again.
+    """
+    return dir(Connection)
+
+
+@pytest.fixture
+def provider_connection(mocker, connection_spec):
+    """
+    Factory fixture for mock Fabric connections in provider tests.
+
+    Returns a callable that builds a mock Connection instance, to be
+    handed to provider methods directly. Providers never construct
+    connections themselves, so the ``Connection`` class is not patched.
+
+    The instance is restricted to the attributes of a real Connection,
+    and defaults to successful ``run`` and ``sudo`` results. Either can
+    be made to fail (exit code 1, with an error message) through the
+    ``run_failed`` and ``sudo_failed`` flags.
+    """
+
+    def _make(*, run_failed: bool = False, sudo_failed: bool = False):
+        mock_cx = mocker.MagicMock(spec_set=connection_spec)
+
+        for method, failed in ((mock_cx.run, run_failed), (mock_cx.sudo, sudo_failed)):
+            method.return_value.failed = failed
+            if failed:
+                method.return_value.return_code = 1
+                method.return_value.stderr = "Generic error"
+
+        return mock_cx
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def fixture_data():
+    """
+    Session-scoped mapping of captured command output, keyed by name.
+
+    Loads every ``tests/data/*.txt`` file once, keyed by file stem, so
+    the raw output strings are read and allocated once per run.
+    """
+    return {path.stem: path.read_text() for path in _DATA_DIR.glob("*.txt")}
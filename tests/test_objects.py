@@ -12,16 +12,17 @@ from exosphere.security import SudoPolicy
 
 
 @pytest.fixture
-def mock_connection(mocker):
+def mock_connection(mocker, connection_spec):
     """
     Fixture to mock the Fabric Connection object.
     Automatically configures context manager support.
     """
     # Mock the Connection class
-    mock_connection_class = mocker.patch("exosphere.objects.Connection", autospec=True)
+    mock_connection_class = mocker.patch("exosphere.objects.Connection", spec_set=True)
 
-    # Create a mock instance with autospec for better validation
-    mock_instance = mock_connection_class.return_value
+    # Create a mock instance restricted to the attributes of a real
+    # Connection, from the spec introspected once per session
+    mock_instance = mocker.MagicMock(spec_set=connection_spec)
     mock_instance.__enter__ = mocker.Mock(return_value=mock_instance)
     mock_instance.__exit__ = mocker.Mock(return_value=None)
 
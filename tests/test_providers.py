@@ -1,4 +1,7 @@
 import logging
+from functools import partial
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 from invoke.exceptions import AuthFailure
@@ -6,7 +9,235 @@ from invoke.exceptions import AuthFailure
 from exosphere.data import Update
 from exosphere.errors import DataRefreshError
 from exosphere.providers import Apt, Dnf, Pkg, PkgAdd, PkgManagerFactory, Yum
-from exosphere.providers.api import requires_sudo
+from exosphere.providers.api import PkgManager, requires_sudo
+
+# Attribute defaults for stand-in command results built by _result
+_RESULT_DEFAULTS = MappingProxyType(
+    {"stdout": "", "stderr": "", "failed": False, "return_code": 0}
+)
+
+
+# Providers rebuild their per-query state (vulnerable or security
+# package lists) on every get_updates call, so one instance per test
+# class is safe to share.
+@pytest.fixture(scope="class")
+def apt():
+    """
+    Class-scoped Apt provider instance shared by the tests.
+    """
+    return Apt()
+
+
+@pytest.fixture(scope="class")
+def pkg():
+    """
+    Class-scoped Pkg provider instance shared by the tests.
+    """
+    return Pkg()
+
+
+@pytest.fixture(scope="class")
+def dnf():
+    """
+    Class-scoped Dnf provider instance shared by the tests.
+    """
+    return Dnf()
+
+
+@pytest.fixture(scope="class")
+def apt_updates(apt, connection_spec, fixture_data):
+    """
+    Updates parsed once per class from the captured apt output.
+
+    The Apt assertion tests all inspect this same list, so the
+    parser only runs once for all of them.
+    """
+    cx = MagicMock(spec_set=connection_spec)
+    cx.run.return_value.configure_mock(
+        stdout=fixture_data["apt_upgrade"], stderr="", failed=False
+    )
+    return apt.get_updates(cx)
+
+
+def _result(**attrs):
+    """
+    Build a stand-in for a Fabric command ``Result``.
+
+    Providers only read attributes off results, so a plain namespace is
+    enough. Anything not given in ``attrs`` gets its default from
+    ``_RESULT_DEFAULTS``.
+    """
+    return SimpleNamespace(**{**_RESULT_DEFAULTS, **attrs})
+
+
+def _command_key(cmd):
+    """
+    Reduce a command line to the subcommand words identifying it.
+
+    The binary and dnf's ``--quiet -y`` noise flags are dropped, and the
+    next two words are kept, so that e.g. ``pkg audit -q`` becomes
+    ``audit -q`` and ``yum --quiet -y check-update`` becomes
+    ``check-update``.
+    """
+    words = [word for word in cmd.split() if word not in ("--quiet", "-y")]
+    return " ".join(words[1:3])
+
+
+def _dispatch_command(handlers, default, cmd, *args, **kwargs):
+    """
+    Side effect body shared by every dispatching run/sudo mock.
+
+    Looks up the canned result for ``cmd`` in ``handlers``, falling
+    back to ``default`` for anything unhandled.
+    """
+    return handlers.get(_command_key(cmd), default)
+
+
+def _dispatch(handlers, default=None):
+    """
+    Build a run/sudo side effect returning canned results per command.
+
+    ``handlers`` maps command keys, as produced by ``_command_key``, to
+    the result returned for that command. Anything else gets ``default``.
+
+    The side effect is a partial over ``_dispatch_command`` rather than
+    a fresh closure, so scenario factories can call this repeatedly.
+    """
+    return partial(_dispatch_command, handlers, default)
+
+
+# Package reported by "pkg audit" in the captured pkg upgrade scenarios
+_PKG_VULNERABLE = "py311-h11-0.14.0_1"
+
+
+def _pkg_upgrade_side_effect(output):
+    """
+    Build a pkg run side effect reporting ``output`` as pending upgrades.
+
+    ``pkg audit -q`` flags ``_PKG_VULNERABLE``, exiting non-zero with
+    no error message as it does on a match.
+    """
+    mock_audit = _result(failed=True, stdout=_PKG_VULNERABLE)
+    mock_packages = _result(stdout=output)
+
+    return _dispatch(
+        {"audit -q": mock_audit, "upgrade -qn": mock_packages},
+        _result(),
+    )
+
+
+# Shared parametrization values, as immutable module-level constants
+_CREATE_PARAMS = (
+    ("apt", Apt),
+    ("pkg", Pkg),
+    ("pkg_add", PkgAdd),
+    ("dnf", Dnf),
+    ("yum", Yum),
+)
+_REPOSYNC_PARAMS = (
+    ("success", True),
+    ("failed", False),
+)
+_INVALID_OUTPUTS = ("Invalid output", "Updates are being launched in space", "->", "")
+
+
+@pytest.fixture
+def connection(request):
+    """
+    Resolve an indirectly parametrized connection fixture by name.
+
+    Shadows Fabric's ``connection`` fixture within this module.
+    """
+    return request.getfixturevalue(request.param)
+
+
+@pytest.fixture
+def connection_variant(request, provider_connection):
+    """
+    Build a mock connection by variant name.
+
+    Indirectly parametrized with either "success", which keeps the
+    default successful results, or "failed", where both ``run`` and
+    ``sudo`` fail with an error message.
+    """
+    failed = request.param == "failed"
+    return provider_connection(run_failed=failed, sudo_failed=failed)
+
+
+@pytest.fixture
+def apt_no_updates(provider_connection):
+    """
+    Connection mock where apt reports no updates.
+    grep fails on the empty output, but there is no error message.
+    """
+    cx = provider_connection()
+    cx.run.return_value.configure_mock(stdout="", failed=True, stderr="")
+    return cx
+
+
+@pytest.fixture
+def pkg_no_updates(provider_connection):
+    """
+    Connection mock where pkg audit is clean and pkg reports no updates.
+    """
+    cx = provider_connection()
+    mock_audit = _result()
+    mock_packages = _result(failed=True)
+    default = _result()
+
+    cx.run.side_effect = _dispatch(
+        {"audit -q": mock_audit, "upgrade -qn": mock_packages}, default
+    )
+    return cx
+
+
+@pytest.fixture
+def dnf_no_updates(provider_connection):
+    """
+    Connection mock where dnf reports no security or regular updates.
+    """
+    cx = provider_connection()
+    mock_security = _result()
+    mock_updates = _result()
+    default = _result()
+
+    cx.run.side_effect = _dispatch(
+        {"check-update --security": mock_security, "check-update": mock_updates},
+        default,
+    )
+    return cx
+
+
+class TestPkgManagerBase:
+    """
+    Tests for the PkgManager abstract base class itself.
+    """
+
+    def test_pkg_manager_base(self, provider_connection):
+        """
+        Ensure the base interface methods raise NotImplementedError when
+        a subclass defers to them, using a single shared instance.
+        """
+
+        class Deferring(PkgManager):
+            def reposync(self, cx):
+                return PkgManager.reposync(self, cx)  # pyright: ignore[reportAbstractUsage]
+
+            def get_updates(self, cx):
+                return PkgManager.get_updates(self, cx)  # pyright: ignore[reportAbstractUsage]
+
+            def get_reboot_status(self, cx):
+                return PkgManager.get_reboot_status(self, cx)  # pyright: ignore[reportAbstractUsage]
+
+        cx = provider_connection()
+        pm = Deferring()
+
+        assert isinstance(pm, PkgManager)
+        assert pm.SUDOERS_COMMANDS is None
+
+        for method in (pm.reposync, pm.get_updates, pm.get_reboot_status):
+            with pytest.raises(NotImplementedError):
+                method(cx)
 
 
 class TestRequiresSudoDecorator:
@@ -83,17 +314,30 @@ class TestRequiresSudoDecorator:
 
 
 class TestPkgManagerFactory:
+    @pytest.fixture(scope="session")
+    def registry(self):
+        """
+        Session-scoped copy of the package manager registry.
+        """
+        return PkgManagerFactory.get_registry()
+
+    @pytest.fixture(scope="session")
+    def created(self, registry):
+        """
+        Session-scoped provider instances, created once per registered name.
+        """
+        return {name: PkgManagerFactory.create(name) for name in registry}
+
     @pytest.mark.parametrize(
         "name, expected_class",
-        [("apt", Apt), ("pkg", Pkg), ("pkg_add", PkgAdd), ("dnf", Dnf), ("yum", Yum)],
-        ids=["apt", "pkg", "pkg_add", "dnf", "yum"],
+        _CREATE_PARAMS,
+        ids=[name for name, _ in _CREATE_PARAMS],
     )
-    def test_create(self, name, expected_class):
+    def test_create(self, created, name, expected_class):
         """
         Test the PkgManagerFactory to create package manager instances.
         """
-        pkg_manager = PkgManagerFactory.create(name)
-        assert isinstance(pkg_manager, expected_class)
+        assert isinstance(created[name], expected_class)
 
     def test_create_invalid(self):
         """
@@ -109,16 +353,11 @@ class TestPkgManagerFactory:
         registry = PkgManagerFactory.get_registry()
 
         assert isinstance(registry, dict)
-        assert len(registry) == 5
-        assert "apt" in registry
-        assert "pkg" in registry
-        assert "dnf" in registry
-        assert "yum" in registry
-        assert "pkg_add" in registry
+        assert registry.keys() == {"apt", "pkg", "pkg_add", "dnf", "yum"}
 
-        # Ensure we got a copy and not the original
-        registry["apt"] = "modified"  # type: ignore
-        assert PkgManagerFactory.get_registry()["apt"] != "modified"
+        # Ensure we get a fresh copy every time, not the original
+        assert registry is not PkgManagerFactory.get_registry()
+        assert registry is not PkgManagerFactory._REGISTRY
 
 
 class TestHostLogBinding:
@@ -172,117 +411,69 @@ class TestHostLogBinding:
 
 class TestAptProvider:
     @pytest.fixture
-    def mock_connection(self, mocker):
+    def mock_connection(self, provider_connection):
         """
         Fixture to mock the Fabric Connection object.
         """
-        mock_cx_class = mocker.patch(
-            "exosphere.providers.debian.Connection", autospec=True
-        )
-        mock_cx = mock_cx_class.return_value
-
-        # Context manager behavior should return the same mock
-        mock_cx.__enter__.return_value = mock_cx
-        mock_cx.__exit__.return_value = False  # Don't suppress exceptions
-
-        # Default to successful run
-        mock_cx.run.return_value.failed = False
-        mock_cx.sudo.return_value.failed = False
+        return provider_connection()
 
-        return mock_cx
-
-    @pytest.fixture
-    def mock_connection_failed(self, mock_connection):
+    @pytest.mark.parametrize(
+        "connection_variant, expected",
+        _REPOSYNC_PARAMS,
+        indirect=["connection_variant"],
+    )
+    def test_reposync(self, apt, connection_variant, expected):
         """
-        Fixture to mock the Fabric Connection object with a failed run.
+        Test the reposync method of the Apt provider.
         """
-        mock_connection.run.return_value.failed = True
-        mock_connection.sudo.return_value.failed = True
-        return mock_connection
+        result = apt.reposync(connection_variant)
 
-    @pytest.fixture
-    def mock_pkg_output(self, mock_connection):
-        """
-        Fixture to mock the output of the apt command enumerating packages.
-        """
-        output = """
-        
-        Inst base-files [12.4+deb12u10] (12.4+deb12u11 Debian:12.11/stable [arm64])
-        Inst bash [5.2.15-2+b7] (5.2.15-2+b8 Debian:12.11/stable [arm64])
-        Inst login [1:4.13+dfsg1-1+b1] (1:4.13+dfsg1-1+deb12u1 Debian:12.11/stable [arm64])
-        Inst libdtovl0 (20250514-1~bookworm Raspberry Pi Foundation:stable [arm64])
-        Inst libgpiolib0 (20250514-1~bookworm Raspberry Pi Foundation:stable [arm64])
+        connection_variant.sudo.assert_called_once_with(
+            "/usr/bin/apt-get update", hide=True, warn=True
+        )
+        assert result is expected
 
-        Inst passwd [1:4.13+dfsg1-1+b1] (1:4.13+dfsg1-1+deb12u1 Debian:12.11/stable [arm64])
-        Inst initramfs-tools [0.142+rpt3+deb12u1] (0.142+rpt3+deb12u3 Raspberry Pi Foundation:stable [all])
-        Inst big-patch [1.0-1] (1.0-2 Debian:12.11/bookworm-security [arm64])
+    def test_get_updates_count(self, apt_updates):
         """
-        mock_connection.run.return_value.stdout = output
-        return mock_connection
+        Test that the Apt provider reports one update per "Inst" line.
+        """
+        assert len(apt_updates) == 8
 
-    @pytest.fixture
-    def mock_pkg_output_no_updates(self, mock_connection):
+    def test_get_updates_regular_update(self, apt_updates):
         """
-        Fixture to mock the output of the apt command when no updates are available.
+        Test that a regular package update is parsed by the Apt provider.
         """
-        mock_connection.run.return_value.stdout = ""
-        mock_connection.run.return_value.failed = True  # grep will fail!
-        mock_connection.run.return_value.stderr = ""  # but no error message
+        update = apt_updates[0]
 
-        return mock_connection
+        assert update.name == "base-files"
+        assert update.current_version == "12.4+deb12u10"
+        assert update.new_version == "12.4+deb12u11"
+        assert update.source == "Debian:12.11/stable"
+        assert not update.security
 
-    @pytest.mark.parametrize(
-        "connection_fixture, expected",
-        [
-            ("mock_connection", True),
-            ("mock_connection_failed", False),
-        ],
-        ids=["success", "failure"],
-    )
-    def test_reposync(self, request, connection_fixture, expected):
+    def test_get_updates_new_package(self, apt_updates):
         """
-        Test the reposync method of the Apt provider.
+        Test that new package updates are correctly identified.
         """
-        mock_connection = request.getfixturevalue(connection_fixture)
+        update = apt_updates[3]
 
-        apt = Apt()
-        result = apt.reposync(mock_connection)
+        assert update.name == "libdtovl0"
+        assert update.current_version is None
+        assert update.new_version == "20250514-1~bookworm"
+        assert update.source == "Raspberry Pi Foundation:stable"
+        assert not update.security
 
-        mock_connection.sudo.assert_called_once_with(
-            "/usr/bin/apt-get update", hide=True, warn=True
-        )
-        assert result is expected
-
-    def test_get_updates(self, mock_pkg_output):
+    def test_get_updates_security(self, apt_updates):
         """
-        Test the get_updates method of the Apt provider.
+        Test that security updates are correctly identified.
         """
-        apt = Apt()
-        updates: list[Update] = apt.get_updates(mock_pkg_output)
-
-        assert len(updates) == 8
-        assert updates[0].name == "base-files"
-        assert updates[0].current_version == "12.4+deb12u10"
-        assert updates[0].new_version == "12.4+deb12u11"
-        assert updates[0].source == "Debian:12.11/stable"
-        assert not updates[0].security
-
-        # Ensure new package updates are correctly identified
-        assert updates[3].name == "libdtovl0"
-        assert updates[3].current_version is None
-        assert updates[3].new_version == "20250514-1~bookworm"
-        assert updates[3].source == "Raspberry Pi Foundation:stable"
-        assert not updates[3].security
+        assert apt_updates[7].name == "big-patch"
+        assert apt_updates[7].security
 
-        # Ensure security updates are correctly identified
-        assert updates[7].name == "big-patch"
-        assert updates[7].security
-
-    def test_get_updates_logs_apt_warnings(self, mock_connection, caplog):
+    def test_get_updates_logs_apt_warnings(self, apt, mock_connection, caplog):
         """
         Test that non-fatal APT stderr output is logged as a warning.
         """
-        apt = Apt()
         mock_connection.run.return_value.stdout = (
             "Inst dovecot-core [1:2.3.19.1+dfsg1-2.1+deb12u1] "
             "(1:2.3.19.1+dfsg1-2.1+deb12u2 Debian:12.11/stable [amd64])"
@@ -302,49 +493,25 @@ class TestAptProvider:
             for message in caplog.messages
         )
 
-    def test_get_updates_no_updates(self, mock_pkg_output_no_updates):
-        """
-        Test the get_updates method of the Apt provider when no updates are available.
-        """
-        apt = Apt()
-
-        updates: list[Update] = apt.get_updates(mock_pkg_output_no_updates)
-
-        assert updates == []
-
-    def test_get_updates_query_failed(self, mock_connection):
+    def test_get_updates_query_failed(self, apt, mock_connection):
         """
         Test the get_updates method of the Apt provider when the query fails.
         """
-        apt = Apt()
         mock_connection.run.return_value.failed = True
         mock_connection.run.return_value.stderr = "Generic error"
 
         with pytest.raises(DataRefreshError):
             apt.get_updates(mock_connection)
 
-    def test_get_updates_invalid_output(self, mock_connection):
-        """
-        Test the get_updates method of the Apt provider with invalid output.
-        Unparsable output in lines should be ignored.
-        """
-        apt = Apt()
-        mock_connection.run.return_value.stdout = "Invalid output"
-
-        results = apt.get_updates(mock_connection)
-
-        assert results == []
-
     @pytest.mark.parametrize(
         "file_present, expected",
         [(True, True), (False, False)],
         ids=["reboot-required", "no-reboot"],
     )
-    def test_get_reboot_status(self, mock_connection, file_present, expected):
+    def test_get_reboot_status(self, apt, mock_connection, file_present, expected):
         """
         Reboot status is driven by the presence of /var/run/reboot-required.
         """
-        apt = Apt()
         mock_connection.run.return_value.ok = file_present
 
         assert apt.get_reboot_status(mock_connection) is expected
@@ -355,272 +522,83 @@ class TestAptProvider:
 
 class TestPkgProvider:
     @pytest.fixture
-    def mock_connection(self, mocker):
+    def mock_connection(self, provider_connection):
         """
         Fixture to mock the Fabric Connection object.
         """
-        mock_cx_class = mocker.patch(
-            "exosphere.providers.freebsd.Connection", autospec=True
-        )
-        mock_cx = mock_cx_class.return_value
-
-        # Context manager behavior should return the same mock
-        mock_cx.__enter__.return_value = mock_cx
-        mock_cx.__exit__.return_value = False  # Don't suppress exceptions
-
-        # Default to successful run
-        mock_cx.run.return_value.failed = False
-
-        return mock_cx
+        return provider_connection()
 
     @pytest.fixture
-    def mock_connection_failed(self, mock_connection):
-        """
-        Fixture to mock the Fabric Connection object with a failed run.
-        """
-        mock_connection.run.return_value.failed = True
-        mock_connection.run.return_value.stderr = "Generic error"
-        return mock_connection
-
-    @pytest.fixture
-    def mock_connection_sudo(self, mock_connection):
-        """
-        Fixture to mock the Fabric Connection object with sudo.
-        """
-        mock_connection.sudo.return_value.failed = False
-        return mock_connection
-
-    @pytest.fixture
-    def mock_connection_sudo_failed(self, mock_connection):
+    def mock_connection_sudo_failed(self, provider_connection):
         """
         Fixture to mock the Fabric Connection object with sudo and a failed run.
         """
-        mock_connection.sudo.return_value.failed = True
-        return mock_connection
+        return provider_connection(sudo_failed=True)
 
     @pytest.fixture
-    def mock_connection_sudo_audit_failed(self, mocker, mock_connection):
+    def mock_connection_sudo_audit_failed(self, mock_connection):
         """
         Fixture to mock a connection where 'pkg update -q' succeeds but
         'pkg audit -qF' fails with a non-empty stderr.
         """
-        mock_update = mocker.MagicMock()
-        mock_update.failed = False
+        mock_update = _result(failed=False)
 
-        mock_audit = mocker.MagicMock()
-        mock_audit.failed = True
-        mock_audit.stderr = "pkg: Unable to fetch vulnerability database"
-
-        def side_effect(cmd, *args, **kwargs):
-            if "pkg audit" in cmd:
-                return mock_audit
-            return mock_update
+        mock_audit = _result(
+            failed=True, stderr="pkg: Unable to fetch vulnerability database"
+        )
 
-        mock_connection.sudo.side_effect = side_effect
+        mock_connection.sudo.side_effect = _dispatch(
+            {"audit -qF": mock_audit}, mock_update
+        )
         return mock_connection
 
     @pytest.fixture
-    def mock_pkg_output(self, mocker, mock_connection):
+    def mock_pkg_output(self, mock_connection, fixture_data):
         """
         Fixture to mock the output of the pkg command enumerating packages.
         """
-        output = """
-        The following 19 package(s) will be affected (of 0 checked):
-
-        Installed packages to be UPGRADED:
-                bash-completion-zfs: 2.3.1
-                btop: 1.4.1 -> 1.4.3
-                cmake: 3.31.6 -> 3.31.7
-                cmake-core: 3.31.6 -> 3.31.7
-                cmake-doc: 3.31.6 -> 3.31.7
-                cmake-man: 3.31.6 -> 3.31.7
-                curl: 8.13.0 -> 8.13.0_2
-                en-freebsd-doc: 20250425,1 -> 20250509,1
-                libgcrypt: 1.11.0 -> 1.11.1
-                mpdecimal: 4.0.0 -> 4.0.1
-                p5-URI: 5.31 -> 5.32
-                pciids: 20250309 -> 20250415
-                py311-cryptography: 44.0.1,1 -> 44.0.2,1
-                py311-h11: 0.14.0_1 -> 0.16.0
-                py311-httpcore: 1.0.7 -> 1.0.9
-                py311-markdown: 3.6 -> 3.7
-                py311-typing-extensions: 4.13.1 -> 4.13.2
-                smartmontools: 7.4_2 -> 7.5
-                vim: 9.1.1265 -> 9.1.1378
-                xxd: 9.1.1265 -> 9.1.1378
-                autoconf-2.72 (direct dependency changed: perl5)
-                net-snmp-5.9.4_6,1 (direct dependency changed: perl5)
-
-        Number of packages to be upgraded: 19
-
-        77 MiB to be downloaded.
-
-        """
-        output_vulnerable = "py311-h11-0.14.0_1"
-
-        mock_audit = mocker.MagicMock()
-        mock_audit.failed = True  # Audit returns non-zero exit code on match
-        mock_audit.stdout = output_vulnerable
-        mock_audit.stderr = ""  # No error message for successful audit
-
-        mock_packages = mocker.MagicMock()
-        mock_packages.failed = False
-        mock_packages.stdout = output
-
-        def side_effect(cmd, *args, **kwargs):
-            if "pkg audit" in cmd:
-                return mock_audit
-            elif "pkg upgrade" in cmd:
-                return mock_packages
-            else:
-                # Default empty response
-                result = mocker.MagicMock()
-                result.stdout = ""
-                result.failed = False
-                result.return_code = 0
-                return result
-
-        mock_connection.run.side_effect = side_effect
-
+        mock_connection.run.side_effect = _pkg_upgrade_side_effect(
+            fixture_data["pkg_upgrade"]
+        )
         return mock_connection
 
     @pytest.fixture
-    def mock_pkg_output_with_repo(self, mocker, mock_connection):
+    def mock_pkg_output_with_repo(self, mock_connection, fixture_data):
         """
         Fixture to mock the output of recent pkg with repo tag in output
         """
-        output = """
-        The following 19 package(s) will be affected (of 0 checked):
-
-        Installed packages to be UPGRADED:
-                bash-completion-zfs: 2.3.1 [FreeBSD]
-                btop: 1.4.1 -> 1.4.3 [FreeBSD]
-                cmake: 3.31.6 -> 3.31.7 [FreeBSD]
-                cmake-core: 3.31.6 -> 3.31.7 [FreeBSD]
-                cmake-doc: 3.31.6 -> 3.31.7 [FreeBSD]
-                cmake-man: 3.31.6 -> 3.31.7 [FreeBSD]
-                curl: 8.13.0 -> 8.13.0_2 [FreeBSD]
-                en-freebsd-doc: 20250425,1 -> 20250509,1 [FreeBSD]
-                libgcrypt: 1.11.0 -> 1.11.1 [FreeBSD]
-                mpdecimal: 4.0.0 -> 4.0.1 [FreeBSD]
-                p5-URI: 5.31 -> 5.32 [FreeBSD]
-                pciids: 20250309 -> 20250415 [FreeBSD]
-                py311-cryptography: 44.0.1,1 -> 44.0.2,1 [FreeBSD]
-                py311-h11: 0.14.0_1 -> 0.16.0 [FreeBSD]
-                py311-httpcore: 1.0.7 -> 1.0.9 [FreeBSD]
-                py311-markdown: 3.6 -> 3.7 [FreeBSD]
-                py311-typing-extensions: 4.13.1 -> 4.13.2 [FreeBSD]
-                smartmontools: 7.4_2 -> 7.5 [FreeBSD]
-                vim: 9.1.1265 -> 9.1.1378 [FreeBSD]
-                xxd: 9.1.1265 -> 9.1.1378 [FreeBSD]
-                autoconf-2.72 [FreeBSD] (direct dependency changed: perl5)
-                net-snmp-5.9.4_6,1 [FreeBSD] (direct dependency changed: perl5)
-
-        Number of packages to be upgraded: 19
-
-        77 MiB to be downloaded.
-
-        """
-        output_vulnerable = "py311-h11-0.14.0_1"
-
-        mock_audit = mocker.MagicMock()
-        mock_audit.failed = True  # Audit returns non-zero exit code on match
-        mock_audit.stdout = output_vulnerable
-        mock_audit.stderr = ""  # No error message for successful audit
-
-        mock_packages = mocker.MagicMock()
-        mock_packages.failed = False
-        mock_packages.stdout = output
-
-        def side_effect(cmd, *args, **kwargs):
-            if "pkg audit" in cmd:
-                return mock_audit
-            elif "pkg upgrade" in cmd:
-                return mock_packages
-            else:
-                # Default empty response
-                result = mocker.MagicMock()
-                result.stdout = ""
-                result.failed = False
-                result.return_code = 0
-                return result
-
-        mock_connection.run.side_effect = side_effect
-
+        mock_connection.run.side_effect = _pkg_upgrade_side_effect(
+            fixture_data["pkg_upgrade_repo"]
+        )
         return mock_connection
 
     @pytest.fixture
-    def mock_pkg_output_audit_failed(self, mocker, mock_connection):
+    def mock_pkg_output_audit_failed(self, mock_connection):
         """
         Fixture to mock the output of the pkg command when the audit fails.
         This simulates a non-zero exit code with an error message.
         """
 
-        mock_audit = mocker.MagicMock()
-        mock_audit.failed = True
-        mock_audit.stdout = ""
-        mock_audit.stderr = "Generic error"
-
-        mock_packages = mocker.MagicMock()
-        mock_packages.failed = False
-        mock_packages.stdout = ""
+        mock_audit = _result(failed=True, stderr="Generic error")
+        mock_packages = _result()
+        default = _result()
 
-        def side_effect(cmd, *args, **kwargs):
-            if "pkg audit" in cmd:
-                return mock_audit
-            elif "pkg upgrade" in cmd:
-                return mock_packages
-            else:
-                # Default empty response
-                result = mocker.MagicMock()
-                result.stdout = ""
-                result.failed = False
-                result.return_code = 0
-                return result
-
-        mock_connection.run.side_effect = side_effect
-        return mock_connection
-
-    @pytest.fixture
-    def mock_pkg_output_no_updates(self, mocker, mock_connection):
-        """
-        Fixture to mock the output of the pkg command when no updates are available.
-        """
-        mock_audit = mocker.MagicMock()
-        mock_audit.failed = False
-        mock_audit.stdout = ""
-        mock_audit.stderr = ""
-
-        mock_packages = mocker.MagicMock()
-        mock_packages.failed = True
-        mock_packages.stderr = ""
-
-        def side_effect(cmd, *args, **kwargs):
-            if "pkg audit" in cmd:
-                return mock_audit
-            elif "pkg upgrade" in cmd:
-                return mock_packages
-            else:
-                # Default empty response
-                result = mocker.MagicMock()
-                result.stdout = ""
-                result.failed = False
-                result.return_code = 0
-                return result
-
-        mock_connection.run.side_effect = side_effect
+        mock_connection.run.side_effect = _dispatch(
+            {"audit -q": mock_audit, "upgrade -qn": mock_packages}, default
+        )
         return mock_connection
 
     @pytest.mark.parametrize(
-        "connection_fixture, expected, expected_sudo_calls",
+        "connection, expected, expected_sudo_calls",
         [
-            ("mock_connection_sudo", True, 2),
+            ("mock_connection", True, 2),
             ("mock_connection_sudo_failed", False, 1),
             ("mock_connection_sudo_audit_failed", False, 2),
         ],
         ids=["success", "pkg_update_failure", "pkg_audit_failure"],
+        indirect=["connection"],
     )
-    def test_reposync(self, request, connection_fixture, expected, expected_sudo_calls):
+    def test_reposync(self, pkg, connection, expected, expected_sudo_calls):
         """
         Test the reposync method of the Pkg provider.
 
@@ -629,23 +607,18 @@ class TestPkgProvider:
         - pkg_update_failure: 'pkg update -q' fails, short-circuits after 1 call.
         - pkg_audit_failure: 'pkg update -q' succeeds but 'pkg audit -qF' fails
         """
-        mock_connection = request.getfixturevalue(connection_fixture)
-
-        pkg = Pkg()
-        result = pkg.reposync(mock_connection)
+        result = pkg.reposync(connection)
 
         # The first sudo call is always 'pkg update -q'
-        mock_connection.sudo.assert_any_call(
-            "/usr/sbin/pkg update -q", hide=True, warn=True
-        )
+        connection.sudo.assert_any_call("/usr/sbin/pkg update -q", hide=True, warn=True)
 
         # When both calls are made, assert the second one too
         if expected_sudo_calls == 2:
-            mock_connection.sudo.assert_any_call(
+            connection.sudo.assert_any_call(
                 "/usr/sbin/pkg audit -qF", hide=True, warn=True
             )
 
-        assert mock_connection.sudo.call_count == expected_sudo_calls
+        assert connection.sudo.call_count == expected_sudo_calls
         assert result is expected
 
     @pytest.mark.parametrize(
@@ -656,7 +629,7 @@ class TestPkgProvider:
         ],
         ids=["legacy_format", "new_pkg_format"],
     )
-    def test_get_updates(self, request, fixture_name, expected_repo_name):
+    def test_get_updates(self, pkg, request, fixture_name, expected_repo_name):
         """
         Test the get_updates method of the Pkg provider.
         Tests both legacy format and new format with repository tags.
@@ -668,8 +641,6 @@ class TestPkgProvider:
         # Get the fixture dynamically
         mock_output = request.getfixturevalue(fixture_name)
 
-        pkg = Pkg()
-
         try:
             updates: list[Update] = pkg.get_updates(mock_output)
         except DataRefreshError as e:
@@ -696,48 +667,15 @@ class TestPkgProvider:
         assert updates[13].source == expected_repo_name
         assert updates[13].security
 
-    def test_get_updates_no_updates(self, mock_pkg_output_no_updates):
-        """
-        Test the get_updates method of the Pkg provider when no updates are available.
-        """
-        pkg = Pkg()
-
-        updates: list[Update] = pkg.get_updates(mock_pkg_output_no_updates)
-
-        assert updates == []
-
-    def test_get_updates_query_failed(self, mock_connection_failed):
+    def test_get_updates_query_failed(self, pkg, provider_connection):
         """
         Test the get_updates method of the Pkg provider when the query fails.
         """
-        pkg = Pkg()
 
         with pytest.raises(DataRefreshError):
-            pkg.get_updates(mock_connection_failed)
+            pkg.get_updates(provider_connection(run_failed=True))
 
-    @pytest.mark.parametrize(
-        "output",
-        ["Invalid output", "Updates are being launched in space", "->", ""],
-        ids=[
-            "invalid_output_1",
-            "invalid_output_2",
-            "invalid_output_3",
-            "empty_output",
-        ],
-    )
-    def test_get_updates_invalid_output(self, mock_connection, output):
-        """
-        Test the get_updates method of the Pkg provider with invalid output.
-        Unparsable output in lines should be ignored.
-        """
-        pkg = Pkg()
-        mock_connection.run.return_value.stdout = output
-
-        results = pkg.get_updates(mock_connection)
-
-        assert results == []
-
-    def test_get_updates_nonzero_exit_audit(self, mock_pkg_output_audit_failed):
+    def test_get_updates_nonzero_exit_audit(self, pkg, mock_pkg_output_audit_failed):
         """
         Test the get_updates method of the Pkg provider when the audit command fails.
 
@@ -745,7 +683,6 @@ class TestPkgProvider:
         and a non-empty stderr, which is the only way to figure out if the
         audit command genuinely failed.
         """
-        pkg = Pkg()
 
         with pytest.raises(DataRefreshError) as e:
             pkg.get_updates(mock_pkg_output_audit_failed)
@@ -763,13 +700,12 @@ class TestPkgProvider:
         ids=["matching", "diverging"],
     )
     def test_get_reboot_status(
-        self, mock_connection, mocker, installed_kernel, running_kernel, expected
+        self, pkg, mock_connection, mocker, installed_kernel, running_kernel, expected
     ):
         """
         Reboot status compares the installed kernel (freebsd-version -k)
         with the running kernel (freebsd-version -r).
         """
-        pkg = Pkg()
 
         mock_connection.run.side_effect = [
             mocker.Mock(failed=False, stdout=installed_kernel),
@@ -797,13 +733,12 @@ class TestPkgProvider:
         ids=["installed-failed", "running-failed", "empty-output"],
     )
     def test_get_reboot_status_unknown(
-        self, mock_connection, mocker, installed, running
+        self, pkg, mock_connection, mocker, installed, running
     ):
         """
         Reboot status degrades to unknown (None) when freebsd-version fails
         or returns an empty kernel version string.
         """
-        pkg = Pkg()
 
         mock_connection.run.side_effect = [
             mocker.Mock(**installed),
@@ -815,120 +750,70 @@ class TestPkgProvider:
 
 class TestPkgAddProvider:
     @pytest.fixture
-    def mock_connection(self, mocker):
+    def mock_connection(self, provider_connection):
         """
         Fixture to mock the Fabric Connection object.
         """
-        mock_cx_class = mocker.patch(
-            "exosphere.providers.openbsd.Connection", autospec=True
-        )
-        mock_cx = mock_cx_class.return_value
-
-        # Context manager behavior should return the same mock
-        mock_cx.__enter__.return_value = mock_cx
-        mock_cx.__exit__.return_value = False  # Don't suppress exceptions
-
-        # Default to successful run
-        mock_cx.run.return_value.failed = False
-
-        return mock_cx
+        return provider_connection()
 
     @pytest.fixture
-    def mock_pkg_add_output(self, mocker, mock_connection):
+    def mock_pkg_add_output(self, fixture_data):
         """
         Fixture to mock the output of the pkg_add command enumerating packages.
 
         From OpenBSD 7.7, only upgradable packages are: curl, htop, isc-bind, libxml
         """
-        output = """
-        Update candidates: curl-8.13.0 -> curl-8.13.1
-        Update candidates: ngtcp2-1.11.0 -> ngtcp2-1.11.0
-        Update candidates: nghttp2-1.65.0 -> nghttp2-1.65.0
-        Update candidates: nghttp3-1.8.0 -> nghttp3-1.8.0
-        Update candidates: desktop-file-utils-0.28p0 -> desktop-file-utils-0.28p0
-        Update candidates: glib2-2.82.5 -> glib2-2.82.5
-        Update candidates: pcre2-10.44 -> pcre2-10.44
-        Update candidates: fio-3.38 -> fio-3.38
-        Update candidates: libnfs-5.0.2 -> libnfs-5.0.2
-        Update candidates: htop-3.4.0 -> htop-3.4.2
-        Update candidates: isc-bind-9.20.11v3 -> isc-bind-9.20.13v3
-        Update candidates: liburcu-0.15.1 -> liburcu-0.15.1
-        Update candidates: libuv-1.50.0p0 -> libuv-1.50.0p0
-        Update candidates: libxml-2.13.8 -> libxml-2.13.9
-        Update candidates: json-c-0.18 -> json-c-0.18
-        Update candidates: libidn2-2.3.0p0 -> libidn2-2.3.0p0
-        Update candidates: libunistring-0.9.7 -> libunistring-0.9.7
-        Update candidates: libsodium-1.0.20 -> libsodium-1.0.20
-        Update candidates: py3-pyrsistent-0.20.0p0 -> py3-pyrsistent-0.20.0p0
-        Update candidates: qemu-ga-9.2.2 -> qemu-ga-9.2.2
-        Update candidates: sudo-1.9.17.1p0-gettext -> sudo-1.9.17.1p0-gettext
-        Update candidates: updatedb-0p0 -> updatedb-0p0
-        Update candidates: vim-9.1.1265-no_x11-python3 -> vim-9.1.1265-no_x11-python3
-        """
-
-        mock_packages = mocker.MagicMock()
-        mock_packages.failed = False
-        mock_packages.stdout = output
-        mock_packages.stderr = "pkg_add should be run as root\n"
+        output = fixture_data["pkg_add_upgrade"]
+
+        mock_packages = _result(
+            failed=False, stdout=output, stderr="pkg_add should be run as root\n"
+        )
 
         return mock_packages
 
     @pytest.fixture
-    def mock_pkg_add_output_no_updates(self, mocker, mock_connection):
+    def mock_pkg_add_output_no_updates(self, fixture_data):
         """
         Fixture to mock the output of the pkg_add command when no updates are available.
         """
-        mock_output = mocker.MagicMock()
-        mock_output.failed = False
-        mock_output.stdout = """
-        Update candidates: ngtcp2-1.11.0 -> ngtcp2-1.11.0
-        Update candidates: nghttp2-1.65.0 -> nghttp2-1.65.0
-        Update candidates: nghttp3-1.8.0 -> nghttp3-1.8.0
-        Update candidates: desktop-file-utils-0.28p0 -> desktop-file-utils-0.28p0
-        Update candidates: glib2-2.82.5 -> glib2-2.82.5
-        Update candidates: pcre2-10.44 -> pcre2-10.44
-        Update candidates: fio-3.38 -> fio-3.38
-        Update candidates: libnfs-5.0.2 -> libnfs-5.0.2
-        """
+        mock_output = _result(failed=False)
+        mock_output.stdout = fixture_data["pkg_add_no_updates"]
         mock_output.stderr = "pkg_add should be run as root\n"
 
         return mock_output
 
     @pytest.fixture
-    def mock_pkg_add_output_no_packages(self, mocker, mock_connection):
+    def mock_pkg_add_output_no_packages(self):
         """
         Fixture to mock the output of pkg_add when no packages have updates
         and grep returns no matches.
         """
-        mock_output = mocker.MagicMock()
-        mock_output.failed = True
-        mock_output.stdout = ""
-        mock_output.stderr = "pkg_add should be run as root\n"
-        mock_output.return_code = 1
+        mock_output = _result(
+            failed=True,
+            stdout="",
+            stderr="pkg_add should be run as root\n",
+            return_code=1,
+        )
 
         return mock_output
 
     @pytest.fixture
-    def mock_system_stable_or_release(self, mocker):
+    def mock_system_stable_or_release(self):
         """
         Fixture to mock the output of syspatch to return a stable or release version
         """
-        mock_version = mocker.MagicMock()
-        mock_version.failed = False
-        mock_version.stdout = ""
-        mock_version.stderr = ""
+        mock_version = _result(failed=False, stdout="", stderr="")
 
         return mock_version
 
     @pytest.fixture
-    def mock_system_current(self, mocker):
+    def mock_system_current(self):
         """
         Fixture to mock the output of syspatch to return a current version
         """
-        mock_version = mocker.MagicMock()
-        mock_version.failed = True
-        mock_version.stdout = ""
-        mock_version.stderr = "syspatch: Unsupported release: 7.8-beta"
+        mock_version = _result(
+            failed=True, stdout="", stderr="syspatch: Unsupported release: 7.8-beta"
+        )
 
         return mock_version
 
@@ -1045,18 +930,14 @@ class TestPkgAddProvider:
         return mock_connection
 
     @pytest.fixture
-    def mock_connection_uname_failed(
-        self, mocker, mock_connection, mock_pkg_add_output
-    ):
+    def mock_connection_uname_failed(self, mock_connection, mock_pkg_add_output):
         """
         Fixture to mock the Fabric Connection object with a failed uname command.
         """
 
         def side_effects(cmd, *args, **kwargs):
             if "syspatch" in cmd:
-                value = mocker.MagicMock()
-                value.failed = True
-                value.stderr = "Generic error"
+                value = _result(failed=True, stderr="Generic error")
                 return value
             else:
                 return mock_pkg_add_output
@@ -1066,7 +947,7 @@ class TestPkgAddProvider:
 
     @pytest.fixture
     def mock_connection_pkg_add_query_failed(
-        self, mocker, mock_connection, mock_system_stable_or_release
+        self, mock_connection, mock_system_stable_or_release
     ):
         """
         Fixture to mock the Fabric Connection object with a failed pkg_add command.
@@ -1076,9 +957,7 @@ class TestPkgAddProvider:
             if "syspatch" in cmd:
                 return mock_system_stable_or_release
             else:
-                value = mocker.MagicMock()
-                value.failed = True
-                value.stderr = "Generic error"
+                value = _result(failed=True, stderr="Generic error")
                 return value
 
         mock_connection.run.side_effect = side_effects
@@ -1086,7 +965,7 @@ class TestPkgAddProvider:
 
     @pytest.fixture
     def mock_connection_pkg_add_invalid_output(
-        self, mocker, mock_connection, mock_system_stable_or_release
+        self, mock_connection, mock_system_stable_or_release
     ):
         """
         Fixture to mock the Fabric Connection object with invalid pkg_add output.
@@ -1096,9 +975,7 @@ class TestPkgAddProvider:
             if "syspatch" in cmd:
                 return mock_system_stable_or_release
             else:
-                value = mocker.MagicMock()
-                value.failed = False
-                value.stdout = "Invalid output"
+                value = _result(failed=False, stdout="Invalid output")
                 return value
 
         mock_connection.run.side_effect = side_effects
@@ -1221,7 +1098,7 @@ class TestPkgAddProvider:
             pkg_add.get_updates(mock_connection)
 
     def test_get_updates_name_change(
-        self, mocker, mock_connection, mock_system_stable_or_release, caplog
+        self, mock_connection, mock_system_stable_or_release, caplog
     ):
         """
         Test the get_updates method of the PkgAdd provider with a package
@@ -1237,9 +1114,7 @@ class TestPkgAddProvider:
             if "syspatch" in cmd:
                 return mock_system_stable_or_release
             else:
-                mock_packages = mocker.MagicMock()
-                mock_packages.failed = False
-                mock_packages.stdout = output
+                mock_packages = _result(failed=False, stdout=output)
                 return mock_packages
 
         mock_connection.run.side_effect = side_effects
@@ -1257,7 +1132,7 @@ class TestPkgAddProvider:
         assert "changed name to newname" in caplog.text
 
     def test_get_updates_flavored_version_bump(
-        self, mocker, mock_connection, mock_system_stable_or_release, caplog
+        self, mock_connection, mock_system_stable_or_release, caplog
     ):
         """
         Test that flavored packages with an actual version bump are reported.
@@ -1275,9 +1150,7 @@ class TestPkgAddProvider:
         def side_effects(cmd, *args, **kwargs):
             if "syspatch" in cmd:
                 return mock_system_stable_or_release
-            mock_packages = mocker.MagicMock()
-            mock_packages.failed = False
-            mock_packages.stdout = output
+            mock_packages = _result(failed=False, stdout=output)
             return mock_packages
 
         mock_connection.run.side_effect = side_effects
@@ -1341,172 +1214,14 @@ class TestPkgAddProvider:
 
 class TestDnfProvider:
     @pytest.fixture
-    def mock_connection(self, mocker):
+    def mock_connection(self, provider_connection):
         """
         Fixture to mock the Fabric Connection object.
         """
-        mock_cx_class = mocker.patch(
-            "exosphere.providers.redhat.Connection", autospec=True
-        )
-        mock_cx = mock_cx_class.return_value
-
-        # Context manager behavior should return the same mock
-        mock_cx.__enter__.return_value = mock_cx
-        mock_cx.__exit__.return_value = False  # Don't suppress exceptions
-
-        mock_cx.run.return_value.failed = False
-        return mock_cx
-
-    @pytest.fixture
-    def mock_connection_failed(self, mocker, mock_connection):
-        """
-        Fixture to mock the Fabric Connection object with a failed run.
-        """
-        mock_connection.run.return_value = mocker.MagicMock()
-        mock_connection.run.return_value.failed = True
-        mock_connection.run.return_value.return_code = 2
-        mock_connection.run.return_value.stderr = "Generic error"
-        return mock_connection
-
-    @pytest.fixture
-    def mock_dnf_output_return(self, mocker):
-        """
-        Fixture to mock the output of the dnf command enumerating packages.
-        """
-        output = """
-
-        emacs-filesystem.noarch               1:27.2-13.el9_6                   appstream
-        expat.x86_64                          2.5.0-5.el9_6                     baseos
-        git.x86_64                            2.47.1-2.el9_6                    appstream
-        git-core.x86_64                       2.47.1-2.el9_6                    appstream
-        git-core-doc.noarch                   2.47.1-2.el9_6                    appstream
-        openssl.x86_64                        3.0.9-16.el9_6                    baseos
-        openssl-libs.x86_64                   3.0.9-16.el9_6                    baseos
-        systemd.x86_64                        252-18.el9_6                      baseos
-        systemd-libs.x86_64                   252-18.el9_6                      baseos
-        curl.x86_64                           7.76.1-19.el9_6                   baseos
-        curl-minimal.x86_64                   7.76.1-19.el9_6                   @baseos
-        Obsoleting Packages
-        libldb.i686                           4.21.3-3.el9                      baseos
-            libldb.x86_64                     2.9.1-2.el9                       @baseos
-        """
-
-        mock_return = mocker.MagicMock()
-        mock_return.stdout = output
-        mock_return.failed = True
-        mock_return.return_code = 100
-
-        return mock_return
-
-    @pytest.fixture
-    def mock_dnf_current_versions_return(self, mocker):
-        """
-        Fixture to mock the output of the dnf command for current versions.
-        """
-
-        output = """
-
-        Installed Packages
-        emacs-filesystem.noarch               1:27.1-10.el9_6                   @appstream
-        expat.x86_64                          2.5.0-3.el9_6                     @baseos
-        git.x86_64                            2.47.0-1.el9_6                    @appstream
-        git-core.x86_64                       2.47.0-1.el9_6                    @appstream
-        git-core-doc.noarch                   2.47.1-2.el9_6                    @appstream
-        openssl.x86_64                        3.0.9-15.el9_5                    @baseos
-        openssl-libs.x86_64                   3.0.9-15.el9_5                    @baseos
-        systemd.x86_64                        252-17.el9_5                      @baseos
-        systemd-libs.x86_64                   252-17.el9_5                      @baseos
-        curl.x86_64                           7.76.1-18.el9_5                   @baseos
-        curl-minimal.x86_64                   7.76.1-18.el9_5                   @baseos
-
-        Available packages
-        git.x86_64                            2.47.1-2.el9_6                    appstream
-        """
-
-        mock_return = mocker.MagicMock()
-        mock_return.stdout = output
-        mock_return.failed = False
-        mock_return.return_code = 0
-
-        return mock_return
-
-    @pytest.fixture
-    def mock_dnf_security_output_return(self, mocker):
-        """
-        Fixture to mock the output of the dnf command for security updates.
-        """
-        output = """
-
-        openssl.x86_64                       3.0.9-16.el9_6                     baseos
-        openssl-libs.x86_64                  3.0.9-16.el9_6                     baseos
-        systemd.x86_64                       252-18.el9_6                       baseos
-        systemd-libs.x86_64                  252-18.el9_6                       baseos
-        kernel.x86_64                        5.14.0-570.18.1.el9_6              baseos
-        Obsoleting Packages
-        libldb.i686                          4.21.3-3.el9                       baseos
-            libldb.x86_64                    2.9.1-2.el9                        @baseos
-        """
-
-        mock_return = mocker.MagicMock()
-        mock_return.stdout = output
-        mock_return.failed = True
-        mock_return.return_code = 100
-
-        return mock_return
+        return provider_connection()
 
     @pytest.fixture
-    def mock_dnf_output_no_updates(self, mocker, mock_connection):
-        """
-        Fixture to mock the output of the dnf command when no updates are available.
-        """
-
-        # Mock for security updates (empty)
-        mock_security = mocker.MagicMock()
-        mock_security.stdout = ""
-        mock_security.return_code = 0
-        mock_security.failed = False
-
-        # Mock for regular updates (empty)
-        mock_updates = mocker.MagicMock()
-        mock_updates.stdout = ""
-        mock_updates.return_code = 0
-        mock_updates.failed = False
-
-        def side_effect(cmd, *args, **kwargs):
-            if "check-update --security" in cmd:
-                return mock_security
-            elif "check-update" in cmd:
-                return mock_updates
-            else:
-                result = mocker.MagicMock()
-                result.stdout = ""
-                result.failed = False
-                result.return_code = 0
-                return result
-
-        mock_connection.run.side_effect = side_effect
-
-        return mock_connection
-
-    @pytest.fixture
-    def run_side_effect_normal(
-        self,
-        mock_dnf_output_return,
-        mock_dnf_security_output_return,
-        mock_dnf_current_versions_return,
-    ):
-        def _side_effect(cmd, *args, **kwargs):
-            if "check-update --security" in cmd:
-                return mock_dnf_security_output_return
-            elif "check-update" in cmd:
-                return mock_dnf_output_return
-            elif "list installed" in cmd:
-                return mock_dnf_current_versions_return
-
-        return _side_effect
-
-    @pytest.fixture
-    def mock_dnf_command_scenario(self, mocker, mock_connection):
+    def mock_dnf_command_scenario(self, mock_connection):
         """
         Flexible fixture factory for DNF command output scenarios.
         Returns a function that can create different DNF output setups.
@@ -1519,78 +1234,56 @@ class TestDnfProvider:
             regular_updates_code=100,
             installed_packages="",
         ):
-            # Mock security updates
-            mock_security = mocker.MagicMock()
-            mock_security.stdout = security_updates
-            mock_security.failed = False
-            mock_security.return_code = 0
-
-            # Mock regular updates
-            mock_updates = mocker.MagicMock()
-            mock_updates.stdout = regular_updates
-            mock_updates.failed = regular_updates_failed
-            mock_updates.return_code = regular_updates_code
-
-            # Mock installed packages
-            mock_versions = mocker.MagicMock()
-            mock_versions.stdout = installed_packages
-            mock_versions.failed = False
-            mock_versions.return_code = 0
-
-            def side_effect(cmd, *args, **kwargs):
-                if "check-update --security" in cmd:
-                    return mock_security
-                elif "check-update" in cmd:
-                    return mock_updates
-                elif "list installed" in cmd:
-                    return mock_versions
-                else:
-                    result = mocker.MagicMock()
-                    result.stdout = ""
-                    result.failed = False
-                    result.return_code = 0
-                    return result
-
-            mock_connection.run.side_effect = side_effect
+            mocks = {
+                # dnf exits with 100 when there are updates to report
+                "check-update --security": _result(
+                    stdout=security_updates,
+                    failed=bool(security_updates),
+                    return_code=100 if security_updates else 0,
+                ),
+                "check-update": _result(
+                    stdout=regular_updates,
+                    failed=regular_updates_failed,
+                    return_code=regular_updates_code,
+                ),
+                "list installed": _result(stdout=installed_packages),
+            }
+
+            mock_connection.run.side_effect = _dispatch(mocks, _result())
             return mock_connection
 
         return create_scenario
 
     @pytest.mark.parametrize(
-        "connection_fixture, expected",
-        [
-            ("mock_connection", True),
-            ("mock_connection_failed", False),
-        ],
-        ids=["success", "failure"],
+        "connection_variant, expected",
+        _REPOSYNC_PARAMS,
+        indirect=["connection_variant"],
     )
-    def test_reposync(self, request, connection_fixture, expected):
+    def test_reposync(self, dnf, connection_variant, expected):
         """
         Test the reposync method of the DNF provider.
         This method is a no-op for Red Hat-based systems, since dnf automatically
         syncs the repositories on update checks.
         """
-        mock_connection = request.getfixturevalue(connection_fixture)
+        result = dnf.reposync(connection_variant)
 
-        dnf = Dnf()
-        result = dnf.reposync(mock_connection)
-
-        mock_connection.run.assert_called_once_with(
+        connection_variant.run.assert_called_once_with(
             "dnf --quiet -y makecache --refresh", hide=True, warn=True
         )
 
         assert result is expected
 
-    def test_get_updates(self, mock_connection, run_side_effect_normal):
+    def test_get_updates(self, dnf, mock_dnf_command_scenario, fixture_data):
         """
         Test the get_updates method of the DNF provider.
-        The data is provided by the mock_dnf_output fixture.
+        The data is provided by the captured dnf output in tests/data.
         """
-        dnf = Dnf()
 
-        # Setup connection side effects for normal run
-        # See fixture for details
-        mock_connection.run.side_effect = run_side_effect_normal
+        mock_connection = mock_dnf_command_scenario(
+            security_updates=fixture_data["dnf_check_update_security"],
+            regular_updates=fixture_data["dnf_check_update"],
+            installed_packages=fixture_data["dnf_list_installed"],
+        )
 
         try:
             updates: list[Update] = dnf.get_updates(mock_connection)
@@ -1625,36 +1318,13 @@ class TestDnfProvider:
         git = update_by_name["git.x86_64"]
         assert git.current_version != "2.47.1-1.el9_5"
 
-    def test_get_updates_no_updates(self, mock_dnf_output_no_updates):
-        """
-        Test the get_updates method of the DNF provider when no updates are available.
-        """
-        dnf = Dnf()
-
-        updates: list[Update] = dnf.get_updates(mock_dnf_output_no_updates)
-
-        assert updates == []
-
-    def test_get_updates_query_failed(self, mock_connection_failed):
+    def test_get_updates_query_failed(self, dnf, provider_connection):
         """
         Test the get_updates method of the DNF provider when the query fails.
         """
-        dnf = Dnf()
 
         with pytest.raises(DataRefreshError):
-            dnf.get_updates(mock_connection_failed)
-
-    def test_get_updates_invalid_output(self, mock_connection):
-        """
-        Test the get_updates method of the DNF provider with invalid output.
-        Unparsable output in lines should be ignored.
-        """
-        dnf = Dnf()
-        mock_connection.run.return_value.stdout = "Invalid output"
-
-        results = dnf.get_updates(mock_connection)
-
-        assert results == []
+            dnf.get_updates(provider_connection(run_failed=True))
 
     @pytest.mark.parametrize(
         "provider, expected_command",
@@ -1666,7 +1336,7 @@ class TestDnfProvider:
     )
     def test_compatibility_mode(
         self,
-        mock_dnf_output_no_updates,
+        dnf_no_updates,
         provider,
         expected_command,
     ):
@@ -1680,12 +1350,12 @@ class TestDnfProvider:
 
         implementation = provider()
 
-        _ = implementation.get_updates(mock_dnf_output_no_updates)
+        _ = implementation.get_updates(dnf_no_updates)
 
         assert implementation.pkgbin == expected_command
 
         # Verify that the correct command binary is used in the calls
-        calls = mock_dnf_output_no_updates.run.call_args_list
+        calls = dnf_no_updates.run.call_args_list
         command_calls = [call[0][0] for call in calls]
 
         # Should contain the expected command binary in security and regular updates
@@ -1699,13 +1369,12 @@ class TestDnfProvider:
             for cmd in command_calls
         )
 
-    def test_get_updates_kernel(self, mock_dnf_command_scenario, caplog):
+    def test_get_updates_kernel(self, dnf, mock_dnf_command_scenario, caplog):
         """
         Test kernel update scenario: 3 kernels installed, 1 new kernel available.
         This tests the slotted package behavior where kernels are stored as lists
         and the latest installed version is used as the current version reference.
         """
-        dnf = Dnf()
 
         # Setup scenario with new kernel in check-update output + dummy package
         mock_connection = mock_dnf_command_scenario(
@@ -1739,13 +1408,12 @@ class TestDnfProvider:
         assert kernel_update.source == "updates"
 
     def test_get_updates_kernel_only_no_regular_updates(
-        self, mock_dnf_command_scenario, caplog
+        self, dnf, mock_dnf_command_scenario, caplog
     ):
         """
         Test that a kernel-only update is correctly detected when no other
         packages have updates available.
         """
-        dnf = Dnf()
 
         mock_connection = mock_dnf_command_scenario(
             regular_updates="kernel.x86_64  5.14.0-570.19.1.el9_7  updates",
@@ -1771,13 +1439,12 @@ class TestDnfProvider:
         assert kernel_update.current_version == "5.14.0-570.16.1.el9_6"
 
     def test_get_updates_with_package_clobbering(
-        self, mock_dnf_command_scenario, caplog
+        self, dnf, mock_dnf_command_scenario, caplog
     ):
         """
         Test get_updates when a non-kernel package has multiple installed versions.
         The last (most recent) installed version should be used as current_version.
         """
-        dnf = Dnf()
 
         mock_connection = mock_dnf_command_scenario(
             regular_updates="openssl.x86_64  3.0.9-17.el9_7  updates",
@@ -1805,13 +1472,12 @@ class TestDnfProvider:
         )
 
     def test_get_updates_with_unknown_installed_source(
-        self, mock_dnf_command_scenario, caplog
+        self, dnf, mock_dnf_command_scenario, caplog
     ):
         """
         Test get_updates when list installed reports source metadata as <unknown>.
         Package name and version should still be parsed into current_version.
         """
-        dnf = Dnf()
 
         mock_connection = mock_dnf_command_scenario(
             regular_updates="fuse-common.x86_64  3.16.2-6.fc42  updates",
@@ -1833,7 +1499,7 @@ class TestDnfProvider:
         assert updates[0].source == "updates"
 
     def test_get_updates_snapshot_caret_version(
-        self, mock_dnf_command_scenario, caplog
+        self, dnf, mock_dnf_command_scenario, caplog
     ):
         """
         Regression: Parser should handle post-release snapshot versions
@@ -1843,7 +1509,6 @@ class TestDnfProvider:
         of being discarded as garbage. These are common on Fedora packages
         built from a git checkout.
         """
-        dnf = Dnf()
 
         mock_connection = mock_dnf_command_scenario(
             regular_updates="""
@@ -1878,14 +1543,13 @@ class TestDnfProvider:
         assert "garbage line" not in caplog.text.casefold()
 
     def test_get_updates_security_annotation_lines_skipped(
-        self, mock_dnf_command_scenario, caplog
+        self, dnf, mock_dnf_command_scenario, caplog
     ):
         """
         Test that 'Security:' annotation lines emitted by newer dnf versions
         are skipped and do not produce spurious Update objects with name
         'Security:'.
         """
-        dnf = Dnf()
 
         mock_connection = mock_dnf_command_scenario(
             regular_updates="""
@@ -1915,7 +1579,7 @@ class TestDnfProvider:
             "security annotation" in r.message.casefold() for r in caplog.records
         )
 
-    def test_get_updates_no_parsable_rows(self, mock_dnf_command_scenario, caplog):
+    def test_get_updates_no_parsable_rows(self, dnf, mock_dnf_command_scenario, caplog):
         """
         Test that a check-update result with exit code 100 but no parsable
         package rows emits a warning and returns early without querying
@@ -1923,7 +1587,6 @@ class TestDnfProvider:
 
         We mostly fill the mock with the kind of extraneous output we skip over.
         """
-        dnf = Dnf()
 
         mock_connection = mock_dnf_command_scenario(
             regular_updates="""
@@ -2006,7 +1669,7 @@ class TestDnfProvider:
         ids=["dnf4-missing-plugin", "generic-error"],
     )
     def test_get_reboot_status_exit1_without_signal_unknown(
-        self, mock_connection, caplog, stderr
+        self, dnf, mock_connection, caplog, stderr
     ):
         """
         Exit 1 alone is not trusted as a reboot. dnf overloads exit 1 for its
@@ -2014,7 +1677,6 @@ class TestDnfProvider:
         'Reboot is required' signal in the output the result degrades to
         unknown rather than a false 'reboot pending'.
         """
-        dnf = Dnf()
         mock_connection.run.return_value.return_code = 1
         mock_connection.run.return_value.stdout = ""
         mock_connection.run.return_value.stderr = stderr
@@ -2024,12 +1686,13 @@ class TestDnfProvider:
 
         assert "Could not determine reboot status" in caplog.text
 
-    def test_get_reboot_status_dnf5_missing_subcommand(self, mock_connection, caplog):
+    def test_get_reboot_status_dnf5_missing_subcommand(
+        self, dnf, mock_connection, caplog
+    ):
         """
         Test that dnf5 with missing needs-restarting subcommand degrades to unknown
         and logs the helpful stderr message.
         """
-        dnf = Dnf()
         mock_connection.run.return_value.return_code = 2
         mock_connection.run.return_value.stderr = (
             'Unknown argument "needs-restarting" for command "dnf5". '
@@ -2055,12 +1718,13 @@ class TestDnfProvider:
 
         assert "yum-utils" in caplog.text
 
-    def test_get_reboot_status_unexpected_failure_warns(self, mock_connection, caplog):
+    def test_get_reboot_status_unexpected_failure_warns(
+        self, dnf, mock_connection, caplog
+    ):
         """
         Any other non-zero exit code degrades to unknown and logs the exit
         code and stderr for diagnosis.
         """
-        dnf = Dnf()
         mock_connection.run.return_value.return_code = 5
         mock_connection.run.return_value.stderr = "oh no THE BEANS HAVE SPILLED!"
 
@@ -2069,3 +1733,35 @@ class TestDnfProvider:
 
         assert "exit 5" in caplog.text
         assert "oh no THE BEANS HAVE SPILLED!" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "provider_cls, connection",
+    [
+        (Apt, "apt_no_updates"),
+        (Pkg, "pkg_no_updates"),
+        (Dnf, "dnf_no_updates"),
+    ],
+    ids=["apt", "pkg", "dnf"],
+    indirect=["connection"],
+)
+def test_get_updates_empty_result(provider_cls, connection):
+    """
+    Test the get_updates method of each provider when no updates are
+    available, then with invalid output.
+    Unparsable output in lines should be ignored.
+    """
+    provider = provider_cls()
+
+    updates: list[Update] = provider.get_updates(connection)
+
+    assert updates == []
+
+    # Reuse the same connection, now succeeding with garbage output
+    connection.run.side_effect = None
+    connection.run.return_value.configure_mock(failed=False, stderr="")
+
+    for output in _INVALID_OUTPUTS:
+        connection.run.return_value.stdout = output
+
+        assert provider.get_updates(connection) == [], output
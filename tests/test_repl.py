@@ -8,20 +8,26 @@ and a couple of leaves that raise) stands in for the real command tree.
 
 import enum
 import logging
+import shlex
+from types import SimpleNamespace
 from typing import Annotated
 
 import pytest
 from cyclopts import App, Parameter
+from prompt_toolkit.completion import CompleteEvent
 from prompt_toolkit.document import Document
 from prompt_toolkit.history import FileHistory, InMemoryHistory
 
 from exosphere import context as app_context
 from exosphere.commands.utils import HOST_PARAMETER, HostArg
 from exosphere.objects import Host
-from exosphere.repl import ExosphereCompleter, ExosphereREPL, start_repl
+from exosphere.repl import BUILTINS, ExosphereCompleter, ExosphereREPL, start_repl
 
 HOST_NAMES = ["web01", "web02", "db01"]
 
+# The completer never inspects the event, so one instance is shared
+_COMPLETE_EVENT = CompleteEvent(completion_requested=True)
+
 
 class SortField(str, enum.Enum):
     """Cheap stand-in enum for a Choice option."""
@@ -32,8 +38,7 @@ class SortField(str, enum.Enum):
     status = "status"
 
 
-@pytest.fixture
-def fake_exosphere(rich_console):
+def _build_exosphere(rich_console):
     """
     A sample App shaped vaguely like Exosphere for testing the REPL.
 
@@ -116,33 +121,97 @@ def fake_exosphere(rich_console):
 
 
 @pytest.fixture
-def completer(fake_exosphere):
-    """A completer bound to the sample app with a fixed host list."""
-    root, _ = fake_exosphere
+def fake_exosphere(rich_console):
+    """A fresh sample app, see :func:`_build_exosphere`."""
+    return _build_exosphere(rich_console)
+
+
+@pytest.fixture(scope="module")
+def completer(rich_console):
+    """
+    A completer bound to the sample app with a fixed host list.
+
+    Module-scoped, since completion never runs commands or mutates the
+    app, so the (cached) introspection is shared across tests.
+    """
+    root, _ = _build_exosphere(rich_console)
     return ExosphereCompleter(root, lambda: list(HOST_NAMES))
 
 
-@pytest.fixture
-def repl(fake_exosphere, mocker, rich_console):
+@pytest.fixture(scope="module")
+def shared_repl(rich_console):
     """
     An instance of the Exosphere REPL bound to the sample app.
 
     History is subbed out to in-memory to avoid filesystem I/O, and the
     console is made deterministic for output assertions.
 
-    Returns (instance, recorder) where recorder collects leaf invocations.
+    Module-scoped, since building the app and REPL dominates the cost
+    of most tests. Use the ``repl`` fixture, which resets it per test.
     """
-    root, recorder = fake_exosphere
-    mocker.patch.object(ExosphereREPL, "_setup_history", return_value=InMemoryHistory())
+    root, recorder = _build_exosphere(rich_console)
     instance = ExosphereREPL(root)
+    instance.history = InMemoryHistory()
     instance.console = rich_console()
     return instance, recorder
 
 
+@pytest.fixture
+def repl(shared_repl):
+    """
+    The shared Exosphere REPL, with leaf invocations cleared.
+
+    Returns (instance, recorder) where recorder collects leaf invocations.
+    """
+    instance, recorder = shared_repl
+    recorder.clear()
+    return instance, recorder
+
+
+@pytest.fixture
+def history_file(mocker, tmp_path):
+    """
+    Factory fixture for a configured REPL history file.
+
+    Returns a callable that points the history configuration at a file
+    in tmp_path with the given max_entries, optionally seeding it with
+    a number of "command <n>" entries, oldest first.
+
+    Returns the path to the history file.
+    """
+
+    def _make(max_entries: int = 1000, *, entries: int = 0, name="history.txt"):
+        path = tmp_path / name
+
+        if entries:
+            seed = FileHistory(str(path))
+            for i in range(entries):
+                seed.append_string(f"command {i}")
+
+        mocker.patch(
+            "exosphere.repl.app_config",
+            {
+                "options": {
+                    "history_file": str(path),
+                    "history_max_entries": max_entries,
+                }
+            },
+        )
+        return path
+
+    return _make
+
+
+def _output(capsys) -> str:
+    """Return everything printed so far, stdout and stderr combined."""
+    captured = capsys.readouterr()
+    return captured.out + captured.err
+
+
 def _raw_completions(completer, text: str) -> list:
     """Return the raw Completion objects for the given input."""
     document = Document(text, cursor_position=len(text))
-    return list(completer.get_completions(document, None))
+    return list(completer.get_completions(document, _COMPLETE_EVENT))
 
 
 def _completions(completer, text: str) -> list[str]:
@@ -153,110 +222,102 @@ def _completions(completer, text: str) -> list[str]:
 class TestReplInit:
     """REPL initialization and setup test suite"""
 
-    def test_history_uses_configured_file(self, fake_exosphere, mocker, tmp_path):
+    def test_history_uses_configured_file(self, fake_exosphere, history_file):
         """History should be setup with file from config"""
         root, _ = fake_exosphere
-        history_file = tmp_path / "history.txt"
-
-        mocker.patch(
-            "exosphere.repl.app_config",
-            {
-                "options": {
-                    "history_file": str(history_file),
-                    "history_max_entries": 1000,
-                }
-            },
-        )
+        history_file()
 
         instance = ExosphereREPL(root)
 
         assert isinstance(instance.history, FileHistory)
 
-    def test_history_trimmed_to_max_entries(self, fake_exosphere, mocker, tmp_path):
-        """Constructing the REPL should trim the history file to max_entries."""
+    def test_history_untouched_until_loaded(self, fake_exosphere, history_file):
+        """Constructing the REPL should not touch the history file."""
         root, _ = fake_exosphere
-        history_file = tmp_path / "history.txt"
+        path = history_file(3, entries=10)
+        original = path.read_text(encoding="utf-8")
 
-        # Seed a history file with 10 entries, oldest first.
-        seed = FileHistory(str(history_file))
-        for i in range(10):
-            seed.append_string(f"command {i}")
+        ExosphereREPL(root)
 
-        mocker.patch(
-            "exosphere.repl.app_config",
-            {"options": {"history_file": str(history_file), "history_max_entries": 3}},
-        )
+        assert path.read_text(encoding="utf-8") == original
 
-        ExosphereREPL(root)
+    def test_history_trimmed_to_max_entries(self, fake_exosphere, history_file):
+        """Loading history should trim the history file to max_entries."""
+        root, _ = fake_exosphere
+        path = history_file(3, entries=10)
+
+        instance = ExosphereREPL(root)
+        loaded = list(instance.history.load_history_strings())
 
         # load_history_strings yields most-recent-first.
-        remaining = list(FileHistory(str(history_file)).load_history_strings())
+        remaining = list(FileHistory(str(path)).load_history_strings())
         assert remaining == ["command 9", "command 8", "command 7"]
+        assert loaded == remaining
 
-    def test_history_not_trimmed_under_limit(self, fake_exosphere, mocker, tmp_path):
+    def test_history_not_trimmed_under_limit(self, fake_exosphere, history_file):
         """A history file under the limit should be left untouched."""
         root, _ = fake_exosphere
-        history_file = tmp_path / "history.txt"
+        path = history_file(10, entries=3)
+        original = path.read_text(encoding="utf-8")
 
-        seed = FileHistory(str(history_file))
-        for i in range(3):
-            seed.append_string(f"command {i}")
-        original = history_file.read_text(encoding="utf-8")
+        list(ExosphereREPL(root).history.load_history_strings())
 
-        mocker.patch(
-            "exosphere.repl.app_config",
-            {"options": {"history_file": str(history_file), "history_max_entries": 10}},
-        )
-
-        ExosphereREPL(root)
-
-        assert history_file.read_text(encoding="utf-8") == original
+        assert path.read_text(encoding="utf-8") == original
 
-    def test_history_trim_disabled_with_zero(self, fake_exosphere, mocker, tmp_path):
+    def test_history_trim_disabled_with_zero(self, fake_exosphere, history_file):
         """A max_entries of 0 disables trimming entirely."""
         root, _ = fake_exosphere
-        history_file = tmp_path / "history.txt"
+        path = history_file(0, entries=10)
+        original = path.read_text(encoding="utf-8")
 
-        seed = FileHistory(str(history_file))
-        for i in range(10):
-            seed.append_string(f"command {i}")
-        original = history_file.read_text(encoding="utf-8")
+        list(ExosphereREPL(root).history.load_history_strings())
 
-        mocker.patch(
-            "exosphere.repl.app_config",
-            {"options": {"history_file": str(history_file), "history_max_entries": 0}},
-        )
+        assert path.read_text(encoding="utf-8") == original
 
-        ExosphereREPL(root)
+    def test_history_trim_missing_file_is_safe(self, fake_exosphere, history_file):
+        """Trimming a non-existent history file should not raise."""
+        root, _ = fake_exosphere
+        history_file(5, name="does_not_exist.txt")
 
-        assert history_file.read_text(encoding="utf-8") == original
+        # Should construct cleanly and fall through to a FileHistory.
+        instance = ExosphereREPL(root)
+        assert isinstance(instance.history, FileHistory)
+        assert list(instance.history.load_history_strings()) == []
 
-    def test_history_trim_missing_file_is_safe(self, fake_exosphere, mocker, tmp_path):
-        """Trimming a non-existent history file should not raise."""
+    def test_history_io_errors_are_not_fatal(
+        self, fake_exosphere, history_file, mocker, caplog
+    ):
+        """Unreadable or unwritable history degrades to in-memory only."""
         root, _ = fake_exosphere
-        history_file = tmp_path / "does_not_exist.txt"
+        history_file()
 
-        mocker.patch(
-            "exosphere.repl.app_config",
-            {"options": {"history_file": str(history_file), "history_max_entries": 5}},
+        mocker.patch.object(
+            FileHistory, "load_history_strings", side_effect=PermissionError("nope")
+        )
+        mocker.patch.object(
+            FileHistory, "store_string", side_effect=PermissionError("nope")
         )
+        caplog.set_level(logging.WARNING, logger="exosphere.repl")
 
-        # Should construct cleanly and fall through to a FileHistory.
         instance = ExosphereREPL(root)
-        assert isinstance(instance.history, FileHistory)
 
-    def test_history_falls_back_to_memory(self, fake_exosphere, mocker, caplog):
+        assert list(instance.history.load_history_strings()) == []
+        instance.history.store_string("host show web01")
+
+        assert "Could not load history file" in caplog.text
+        assert "Could not write to history file" in caplog.text
+
+    def test_history_falls_back_to_memory(
+        self, fake_exosphere, history_file, mocker, caplog
+    ):
         root, _ = fake_exosphere
 
         # Ensure history file is configured
-        mocker.patch(
-            "exosphere.repl.app_config",
-            {"options": {"history_file": "/some/path", "history_max_entries": 1000}},
-        )
+        history_file()
 
         # Oh no! FileHistory died somehow!
         mocker.patch(
-            "exosphere.repl.FileHistory",
+            "exosphere.repl._LazyFileHistory",
             side_effect=OSError("Disk write super died or whatever"),
         )
 
@@ -274,10 +335,10 @@ class TestReplInit:
             ExosphereREPL, "_setup_history", return_value=InMemoryHistory()
         )
 
-        fake_inventory = mocker.Mock()
-        host1, host2 = mocker.Mock(), mocker.Mock()
-        host1.name, host2.name = "alpha", "bravo"
-        fake_inventory.hosts = [host1, host2]
+        # Completion only ever reads host names
+        fake_inventory = SimpleNamespace(
+            hosts=[SimpleNamespace(name="alpha"), SimpleNamespace(name="bravo")]
+        )
 
         mocker.patch.object(app_context, "inventory", fake_inventory)
 
@@ -288,6 +349,26 @@ class TestReplInit:
         assert "alpha" in result
         assert "bravo" in result
 
+    def test_host_completion_follows_inventory_reload(self, fake_exosphere, mocker):
+        root, _ = fake_exosphere
+
+        mocker.patch.object(
+            ExosphereREPL, "_setup_history", return_value=InMemoryHistory()
+        )
+
+        fake_inventory = SimpleNamespace(hosts=[SimpleNamespace(name="alpha")])
+
+        mocker.patch.object(app_context, "inventory", fake_inventory)
+
+        instance = ExosphereREPL(root)
+
+        assert _completions(instance.completer, "host show ") == ["alpha"]
+
+        # Reloading the inventory replaces the host list entirely
+        fake_inventory.hosts = [SimpleNamespace(name="bravo")]
+
+        assert _completions(instance.completer, "host show ") == ["bravo"]
+
     def test_no_inventory_yields_no_host_completion(self, fake_exosphere, mocker):
         root, _ = fake_exosphere
 
@@ -440,6 +521,30 @@ class TestCompleterBehavior:
         assert "--updates" not in result
         assert "--port" in result
 
+    def test_host_completion_follows_inventory_changes(self, fake_exosphere):
+        """Host names are picked up again when the inventory changes"""
+        root, _ = fake_exosphere
+        names = ["web01", "db01"]
+        completer = ExosphereCompleter(root, lambda: names)
+
+        assert _completions(completer, "host show ") == ["db01", "web01"]
+
+        names = ["web02", "app01", "web01"]
+
+        assert _completions(completer, "host show ") == ["app01", "web01", "web02"]
+        assert _completions(completer, "host show web") == ["web01", "web02"]
+
+    def test_repeated_completion_is_memoized(self, completer, mocker):
+        """Completing the same line again reuses the previous results"""
+        first = _raw_completions(completer, "host show --sort ")
+        spy = mocker.spy(completer, "_completions")
+
+        second = _raw_completions(completer, "host show --sort ")
+
+        assert first
+        assert second == first
+        spy.assert_not_called()
+
 
 class TestReplCommands:
     """REPL behavior during execution of commands"""
@@ -461,15 +566,6 @@ class TestReplCommands:
 
         mock_clear.assert_called_once()
 
-    def test_parse_error_is_reported(self, repl, capsys):
-        instance, _ = repl
-
-        # Unterminated quotes will make shlex raise.
-        # We expect this to be displayed, not crash the REPL
-        instance.execute_command('host show "unterminated')
-
-        assert "Error parsing command" in capsys.readouterr().out
-
     def test_known_command_is_dispatched(self, repl):
         instance, recorder = repl
 
@@ -477,15 +573,45 @@ class TestReplCommands:
 
         assert ("status", SortField.host) in recorder
 
-    def test_help_lists_commands_including_hidden_groups(self, repl, capsys):
+    @pytest.mark.parametrize(
+        "line, expected",
+        [
+            ("help", ["host", "inventory", "connections"]),  # incl. hidden group
+            ("help exit", ["Built-in", BUILTINS["exit"]]),
+            ("help clear", ["Built-in", BUILTINS["clear"]]),
+            ("help help", ["that is indeed how that works"]),  # no recursion
+        ],
+        ids=["general", "builtin_exit", "builtin_clear", "help_help"],
+    )
+    def test_help_output(self, repl, capsys, line, expected):
+        """General help lists commands, builtins describe themselves."""
         instance, _ = repl
 
-        instance.execute_command("help")
+        instance.execute_command(line)
         out = capsys.readouterr().out
 
-        assert "host" in out
-        assert "inventory" in out
-        assert "connections" in out  # hidden group
+        for fragment in expected:
+            assert fragment in out
+
+    def test_help_panel_is_built_once(self, repl, mocker, capsys):
+        instance, _ = repl
+        instance._invalidate_help_panel()
+        spy = mocker.spy(instance, "_build_help_panel")
+
+        instance.execute_command("help")
+        first = capsys.readouterr().out
+        instance.execute_command("help")
+
+        assert capsys.readouterr().out == first
+        spy.assert_called_once()
+
+    def test_general_help_is_printed_at_once(self, repl, mocker):
+        instance, _ = repl
+        print_spy = mocker.patch.object(instance.console, "print")
+
+        instance.execute_command("help")
+
+        print_spy.assert_called_once()
 
     def test_command_help_flag_shows_usage(self, repl, capsys):
         instance, _ = repl
@@ -516,24 +642,6 @@ class TestReplCommands:
         assert "show" in out
         assert "ping" in out
 
-    def test_help_for_builtin_shows_its_description(self, repl, capsys):
-        """Builtins describe themselves rather than a CLI command."""
-        instance, _ = repl
-
-        instance.execute_command("help exit")
-        out = capsys.readouterr().out
-
-        assert "Built-in" in out
-        assert instance.builtins["exit"] in out
-
-    def test_help_help_easter_egg(self, repl, capsys):
-        """help help does not recurse"""
-        instance, _ = repl
-
-        instance.execute_command("help help")
-
-        assert "that is indeed how that works" in capsys.readouterr().out
-
     def test_help_for_command_is_scoped_to_the_command(self, repl, capsys):
         """help for subcommands route to scoped help."""
         instance, _ = repl
@@ -544,36 +652,17 @@ class TestReplCommands:
         assert "show" in out  # it is the host group's help
         assert "exosphere" not in out  # root command is stripped
 
-    def test_help_for_unknown_command_reports_it(self, repl, capsys):
-        """Help reports the unknown command, not root help."""
-        instance, _ = repl
-
-        instance.execute_command("help defenestrate")
-        captured = capsys.readouterr()
-        combined = captured.out + captured.err
-
-        assert "Unknown command" in combined
-        assert "defenestrate" in combined
-
-    def test_help_flag_on_unknown_command_reports_it(self, repl, capsys):
-        """Help flags on unknown commands should also report the unknown command"""
-        instance, _ = repl
-
-        instance.execute_command("defenestrate --help")
-        captured = capsys.readouterr()
-        combined = captured.out + captured.err
-
-        assert "Unknown command" in combined
-        assert "defenestrate" in combined
-
-    def test_empty_line_is_noop(self, repl, capsys):
+    @pytest.mark.parametrize("line", ["", "   "], ids=["empty", "whitespace"])
+    def test_empty_line_is_noop(self, repl, mocker, capsys, line):
         """A blank line dispatches nothing and prints nothing."""
         instance, recorder = repl
+        split = mocker.spy(shlex, "split")
 
-        instance.execute_command("   ")
+        instance.execute_command(line)
 
         assert recorder == []
         assert capsys.readouterr().out == ""
+        split.assert_not_called()
 
     def test_command_exit_code_does_not_leave_the_repl(self, repl):
         """SystemExit must not raise out of the REPL loop"""
@@ -581,15 +670,6 @@ class TestReplCommands:
 
         instance.execute_command("inventory boom")
 
-    def test_unexpected_exception_is_reported(self, repl, capsys):
-        """Unexpected exceptions must not raise out of the REPL loop"""
-        instance, _ = repl
-
-        # This command in fake_exosphere raises a RuntimeError
-        instance.execute_command("inventory explode")
-
-        assert "Error executing" in capsys.readouterr().out
-
     def test_internal_error_in_builtin_is_reported(self, repl, mocker, capsys):
         """
         The execute_command catch-all reports unexpected failures in the
@@ -605,35 +685,41 @@ class TestReplCommands:
 
         assert "Error executing command" in capsys.readouterr().out
 
-    def test_unknown_command_suggests_alternatives(self, repl, capsys):
-        """
-        Unknown commands should yield a helpful message and suggestions.
-
-        This is built-in Cyclopts functionality, but we want to ensure
-        it's correctly wired up through the REPL and not swallowed by
-        our own error handling.
-        """
+    @pytest.mark.parametrize(
+        "line, expected",
+        [
+            # Unterminated quotes make shlex raise
+            ('host show "unterminated', ["Error parsing command"]),
+            # Help reports the unknown command, not root help
+            ("help defenestrate", ["Unknown command", "defenestrate"]),
+            ("defenestrate --help", ["Unknown command", "defenestrate"]),
+            # Built-in Cyclopts suggestions, not swallowed by our handling
+            ("hsot", ["Did you mean", "host"]),
+            # This command in fake_exosphere raises a RuntimeError
+            ("inventory explode", ["Error executing"]),
+        ],
+        ids=[
+            "parse_error",
+            "help_unknown",
+            "help_flag_unknown",
+            "suggests_alternatives",
+            "unexpected_exception",
+        ],
+    )
+    def test_errors_are_reported(self, repl, capsys, line, expected):
+        """Errors are displayed to the user, never raised out of the REPL."""
         instance, _ = repl
 
-        instance.execute_command("hsot")
+        instance.execute_command(line)
+        output = _output(capsys)
 
-        captured = capsys.readouterr()
-        output = captured.out + captured.err
-        assert "Did you mean" in output
-        assert "host" in output
+        for fragment in expected:
+            assert fragment in output
 
 
 class TestReplLoop:
     """Test the interactive loop UX"""
 
-    def test_intro_is_printed(self, repl, mocker, capsys):
-        instance, _ = repl
-        mocker.patch("exosphere.repl.prompt", side_effect=EOFError)
-
-        instance.cmdloop(intro="Sup, nerds?")
-
-        assert "Sup, nerds?" in capsys.readouterr().out
-
     def test_blank_input_is_skipped(self, repl, mocker):
         instance, _ = repl
         mocker.patch("exosphere.repl.prompt", side_effect=["   ", EOFError])
@@ -654,49 +740,39 @@ class TestReplLoop:
 
         assert ("status", SortField.host) in recorder
 
-    def test_loop_recovers_from_unexpected_error(self, repl, mocker, capsys):
-        """
-        An unexpected error during a loop iteration (here from the prompt
-        itself) is caught and reported; the loop keeps going rather than
-        crashing out.
-        """
-        instance, _ = repl
-        mocker.patch(
-            "exosphere.repl.prompt", side_effect=[RuntimeError("OHNOES"), EOFError]
-        )
-
-        instance.cmdloop()
-
-        out = capsys.readouterr().out
-        assert "Unexpected error in REPL" in out
-        # Reaching the EOF message proves the loop continued past the error.
-        assert "Exiting" in out
-
     @pytest.mark.parametrize(
-        "inputs, expected_message",
+        "inputs, intro, expected",
         [
-            ([EOFError], "Exiting"),
-            ([KeyboardInterrupt, EOFError], "Aborted"),  # Exit after ^C
+            ([EOFError], "Sup, nerds?", ["Sup, nerds?", "Exiting"]),
+            ([EOFError], None, ["Exiting"]),
+            ([KeyboardInterrupt, EOFError], None, ["Aborted", "Exiting"]),
+            # Reaching the EOF message proves the loop continued past the error
+            (
+                [RuntimeError("OHNOES"), EOFError],
+                None,
+                ["Unexpected error in REPL", "Exiting"],
+            ),
         ],
-        ids=["ctrl_d_exits", "ctrl_c_aborts"],
+        ids=["intro", "ctrl_d_exits", "ctrl_c_aborts", "recovers_from_error"],
     )
-    def test_control_signal_is_handled(
-        self, repl, mocker, capsys, inputs, expected_message
-    ):
+    def test_loop_output(self, repl, mocker, capsys, inputs, intro, expected):
         """
-        Signals like ^C and ^D should be handled properly
+        The loop presents its intro, signals and errors properly
 
-        All tests rely on raising EOFError to exit the loop after the
-        command is sent, so that may be slightly Extra(tm) here, but
-        this test also validates the presentation of it (displayed
-        message, no unexpected tracebacks, etc).
+        ^C aborts the current input and an unexpected error (here from
+        the prompt itself) is reported, but neither leaves the loop.
+        Every case ends with ^D (EOFError), which exits gracefully, so
+        this also validates the presentation of it (displayed message,
+        no unexpected tracebacks, etc).
         """
         instance, _ = repl
         mocker.patch("exosphere.repl.prompt", side_effect=inputs)
 
-        instance.cmdloop()
+        instance.cmdloop(intro=intro)
+        out = capsys.readouterr().out
 
-        assert expected_message in capsys.readouterr().out
+        for fragment in expected:
+            assert fragment in out
 
 
 class TestStartRepl:
@@ -3,103 +3,134 @@ Tests for the reporting module.
 """
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import jinja2
-import jsonschema
 import pytest
+from jsonschema.validators import validator_for
 
+from exosphere import __version__, fspaths
 from exosphere.data import Update
 from exosphere.objects import Host
-from exosphere.reporting import ReportRenderer, ReportScope, ReportType
+from exosphere.reporting import (
+    HostUpdates,
+    ReportRenderer,
+    ReportScope,
+    ReportSummary,
+    ReportType,
+)
 from exosphere.schema import get_host_report_schema
 
+# Single refresh reference time shared by all fixtures. Staleness is
+# still judged against the real clock by Host.is_stale, so this must
+# stay anchored to the current time rather than a fixed date.
+_NOW = datetime.now(tz=timezone.utc)
 
-class TestReportRenderer:
-    """Tests for the ReportRenderer class."""
 
-    @pytest.fixture
-    def renderer(self):
-        """Create a ReportRenderer instance for testing."""
-        return ReportRenderer()
-
-    @pytest.fixture
-    def sample_host(self):
-        """Create a sample Host object with updates for testing."""
-        host = Host(
-            name="test-host",
-            ip="192.168.1.100",
-            description="Test server for unit tests",
-        )
-        host.os = "linux"
-        host.flavor = "ubuntu"
-        host.version = "22.04"
-        host.package_manager = "apt"
-        host.last_refresh = datetime.now(tz=timezone.utc)
-        host.supported = True
-
-        # Add some test updates
-        host.updates = [
-            Update(
-                name="curl",
-                current_version="7.81.0-1ubuntu1.4",
-                new_version="7.81.0-1ubuntu1.6",
-                security=True,
-                source="security",
-            ),
-            Update(
-                name="vim",
-                current_version="2:8.2.3458-2ubuntu2.2",
-                new_version="2:8.2.3458-2ubuntu2.4",
-                security=False,
-                source="updates",
-            ),
-        ]
+@pytest.fixture(scope="module")
+def renderer():
+    """
+    Create a ReportRenderer instance for testing.
 
-        return host
+    Module-scoped, since rendering never mutates the renderer, and the
+    Jinja environments and compiled templates can be shared.
+    """
+    return ReportRenderer()
+
+
+# Host fixtures are built once per module and shared across tests.
+# Rendering only reads them, so tests must treat them as read-only.
+@pytest.fixture(scope="module")
+def sample_host():
+    """Create a sample Host object with updates for testing."""
+    host = Host(
+        name="test-host",
+        ip="192.168.1.100",
+        description="Test server for unit tests",
+    )
+    host.os = "linux"
+    host.flavor = "ubuntu"
+    host.version = "22.04"
+    host.package_manager = "apt"
+    host.last_refresh = _NOW
+    host.supported = True
+
+    # Add some test updates
+    host.updates = [
+        Update(
+            name="curl",
+            current_version="7.81.0-1ubuntu1.4",
+            new_version="7.81.0-1ubuntu1.6",
+            security=True,
+            source="security",
+        ),
+        Update(
+            name="vim",
+            current_version="2:8.2.3458-2ubuntu2.2",
+            new_version="2:8.2.3458-2ubuntu2.4",
+            security=False,
+            source="updates",
+        ),
+    ]
+
+    return host
+
+
+@pytest.fixture(scope="module")
+def empty_host():
+    """Create a Host object without updates for testing."""
+    host = Host(
+        name="empty-host",
+        ip="192.168.1.101",
+    )
+    host.os = "linux"
+    host.package_manager = "apt"
+    host.last_refresh = None  # Never refreshed
+    host.updates = []
+
+    return host
 
-    @pytest.fixture
-    def empty_host(self):
-        """Create a Host object without updates for testing."""
-        host = Host(
-            name="empty-host",
-            ip="192.168.1.101",
-        )
-        host.os = "linux"
-        host.package_manager = "apt"
-        host.last_refresh = None  # Never refreshed
-        host.updates = []
-
-        return host
-
-    @pytest.fixture
-    def stale_host(self):
-        """Create a Host object with stale data for testing."""
-        from datetime import timedelta
-
-        host = Host(
-            name="stale-host",
-            ip="192.168.1.102",
-            description="Host with stale data",
-        )
-        host.os = "linux"
-        host.flavor = "ubuntu"
-        host.version = "22.04"
-        host.package_manager = "apt"
-        # Set last_refresh to 25 hours ago (past default 24h stale threshold)
-        host.last_refresh = datetime.now(tz=timezone.utc) - timedelta(hours=25)
-        host.supported = True
-        host.updates = [
-            Update(
-                name="test-package",
-                current_version="1.0.0",
-                new_version="1.0.1",
-                security=False,
-                source="main",
-            ),
-        ]
 
-        return host
+@pytest.fixture(scope="module")
+def markup_host():
+    """Create a Host object with markup in its description for testing."""
+    host = Host(name="markup-host", ip="192.168.1.103")
+    host.description = "<b>Bold</b> & brash"
+    host.updates = []
+
+    return host
+
+
+@pytest.fixture(scope="module")
+def stale_host():
+    """Create a Host object with stale data for testing."""
+    host = Host(
+        name="stale-host",
+        ip="192.168.1.102",
+        description="Host with stale data",
+    )
+    host.os = "linux"
+    host.flavor = "ubuntu"
+    host.version = "22.04"
+    host.package_manager = "apt"
+    # Set last_refresh to 25 hours ago (past default 24h stale threshold)
+    host.last_refresh = _NOW - timedelta(hours=25)
+    host.supported = True
+    host.updates = [
+        Update(
+            name="test-package",
+            current_version="1.0.0",
+            new_version="1.0.1",
+            security=False,
+            source="main",
+        ),
+    ]
+
+    return host
+
+
+class TestReportRenderer:
+    """Tests for the ReportRenderer class."""
 
     def test_renderer_initialization(self, renderer):
         """Test that ReportRenderer initializes correctly."""
@@ -112,6 +143,56 @@ class TestReportRenderer:
         assert renderer.text_env.trim_blocks is True
         assert renderer.text_env.lstrip_blocks is True
 
+    def test_bytecode_cache_stores_compiled_templates(self, mocker, tmp_path):
+        """Compiled templates are persisted per version and environment."""
+        mocker.patch.object(fspaths, "CACHE_DIR", tmp_path)
+
+        renderer = ReportRenderer()
+        renderer.text_env.get_template("report.txt.j2")
+
+        cache_dir = tmp_path / "templates" / __version__
+        assert renderer.env.bytecode_cache is not renderer.text_env.bytecode_cache
+        assert any((cache_dir / "text").iterdir())
+        assert not any((cache_dir / "html").iterdir())
+
+    def test_bytecode_cache_is_optional(self, mocker, tmp_path):
+        """An unusable cache directory disables the cache, not rendering."""
+        blocker = tmp_path / "not-a-directory"
+        blocker.write_text("")
+        mocker.patch.object(fspaths, "CACHE_DIR", blocker)
+
+        renderer = ReportRenderer()
+
+        assert renderer.env.bytecode_cache is None
+        assert renderer.text_env.bytecode_cache is None
+        assert renderer.text_env.get_template("report.txt.j2") is not None
+
+    @pytest.mark.parametrize("method", ["load_bytecode", "dump_bytecode"])
+    def test_bytecode_cache_errors_are_ignored(self, mocker, tmp_path, method):
+        """Failing cache reads or writes do not break rendering."""
+        mocker.patch.object(fspaths, "CACHE_DIR", tmp_path)
+        mocker.patch.object(
+            jinja2.FileSystemBytecodeCache, method, side_effect=OSError("disk full")
+        )
+
+        renderer = ReportRenderer()
+        result = renderer.render_text(
+            [],
+            hosts_count=0,
+            report_type=ReportType.full,
+            report_scope=ReportScope.complete,
+        )
+
+        assert "Total hosts: 0" in result
+
+    def test_templates_are_compiled_once(self, renderer):
+        """Templates are served from the environment cache without reloads."""
+        for env in (renderer.env, renderer.text_env):
+            assert env.auto_reload is False
+
+        first = renderer.text_env.get_template("report.txt.j2")
+        assert renderer.text_env.get_template("report.txt.j2") is first
+
     @pytest.mark.parametrize(
         "text_mode,expected_trim,expected_lstrip",
         [
@@ -338,6 +419,60 @@ class TestReportRenderer:
             )
             assert expected_checks[format_name](result)
 
+    @pytest.mark.parametrize(
+        "format_name,expected",
+        [
+            ("text", "<b>Bold</b> & brash"),
+            ("markdown", "<b>Bold</b> & brash"),
+            ("html", "&lt;b&gt;Bold&lt;/b&gt; &amp; brash"),
+        ],
+        ids=["text", "markdown", "html"],
+    )
+    def test_render_autoescape(self, renderer, markup_host, format_name, expected):
+        """Only HTML output escapes markup in host data."""
+        render_method = getattr(renderer, f"render_{format_name}")
+        result = render_method(
+            [markup_host],
+            hosts_count=1,
+            report_type=ReportType.full,
+            report_scope=ReportScope.filtered,
+        )
+
+        assert expected in result
+
+    def test_render_html_ignores_unescaped_bytecode(
+        self, mocker, tmp_path, markup_host
+    ):
+        """
+        HTML bytecode compiled without autoescaping is never served.
+
+        Earlier versions shared one cache directory across environments
+        and compiled HTML templates without autoescaping. Neither that
+        cache, nor the current text environment's, may leak into HTML.
+        """
+        mocker.patch.object(fspaths, "CACHE_DIR", tmp_path)
+        for cache_dir in (
+            tmp_path / "templates",
+            tmp_path / "templates" / __version__ / "text",
+        ):
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            unescaped = jinja2.Environment(
+                loader=jinja2.PackageLoader("exosphere"),
+                autoescape=False,
+                bytecode_cache=jinja2.FileSystemBytecodeCache(str(cache_dir)),
+            )
+            unescaped.get_template("report.html.j2")
+
+        result = ReportRenderer().render_html(
+            [markup_host],
+            hosts_count=1,
+            report_type=ReportType.full,
+            report_scope=ReportScope.filtered,
+        )
+
+        assert "&lt;b&gt;Bold&lt;/b&gt; &amp; brash" in result
+        assert "<b>Bold</b>" not in result
+
     def test_render_html_with_navigation(self, renderer, sample_host, empty_host):
         """Test HTML rendering with navigation enabled (default)"""
         hosts = [sample_host, empty_host]
@@ -471,151 +606,196 @@ class TestReportRenderer:
         assert "curl" in result
         assert "vim" not in result
 
-    def test_render_text_stale_indicator(self, renderer, stale_host):
-        """Test that stale hosts show a stale indicator in text output."""
-        hosts = [stale_host]
-        result = renderer.render_text(
-            hosts,
+    @pytest.mark.parametrize("format_name", ["text", "markdown", "html"])
+    def test_render_stale_indicator(self, renderer, stale_host, format_name):
+        """Test that stale hosts show a stale indicator in every format."""
+        render_method = getattr(renderer, f"render_{format_name}")
+        result = render_method(
+            [stale_host],
             hosts_count=1,
             report_type=ReportType.full,
             report_scope=ReportScope.filtered,
         )
 
-        # Should contain stale indicator
+        # Should contain stale indicator (as a CSS class for HTML)
         assert "stale-host" in result
-        assert "Stale" in result or "stale" in result
+        assert "stale" in result.lower()
 
-    def test_render_markdown_stale_indicator(self, renderer, stale_host):
-        """Test that stale hosts show a stale indicator in markdown output."""
-        hosts = [stale_host]
-        result = renderer.render_markdown(
-            hosts,
+
+class TestHostUpdates:
+    """Tests for the per-render partition of host updates."""
+
+    def test_from_host(self, sample_host):
+        """Test that updates are split into security and regular ones."""
+        partition = HostUpdates.from_host(sample_host)
+
+        assert partition.updates is sample_host.updates
+        assert [u.name for u in partition.security] == ["curl"]
+        assert [u.name for u in partition.regular] == ["vim"]
+
+    @pytest.mark.parametrize(
+        "report_type,expected",
+        [
+            (ReportType.full, ["curl", "vim"]),
+            (ReportType.updates_only, ["curl", "vim"]),
+            (ReportType.security_only, ["curl"]),
+        ],
+        ids=["full", "updates_only", "security_only"],
+    )
+    def test_for_report(self, sample_host, report_type, expected):
+        """Test that security reports only list security updates."""
+        partition = HostUpdates.from_host(sample_host)
+
+        assert [u.name for u in partition.for_report(report_type)] == expected
+
+    def test_security_updates_read_once_per_render(self, renderer, sample_host, mocker):
+        """Test that templates never re-filter a host's updates."""
+        spy = mocker.patch.object(
+            Host, "security_updates", new_callable=mocker.PropertyMock
+        )
+
+        renderer.render_html(
+            [sample_host],
             hosts_count=1,
-            report_type=ReportType.full,
-            report_scope=ReportScope.filtered,
+            report_type=ReportType.security_only,
+            report_scope=ReportScope.complete,
         )
 
-        # Should contain stale indicator
-        assert "stale-host" in result
-        assert "Stale" in result or "stale" in result
+        spy.assert_not_called()
 
-    def test_render_html_stale_indicator(self, renderer, stale_host):
-        """Test that stale hosts show a stale indicator in HTML output."""
-        hosts = [stale_host]
-        result = renderer.render_html(
-            hosts,
-            hosts_count=1,
-            report_type=ReportType.full,
-            report_scope=ReportScope.filtered,
+
+class TestReportSummary:
+    """Tests for the precomputed report summary statistics."""
+
+    def test_from_host_updates(self, sample_host, empty_host, stale_host):
+        """Test that summary counts are aggregated across hosts."""
+        hosts = [sample_host, empty_host, stale_host]
+        summary = ReportSummary.from_host_updates(
+            [HostUpdates.from_host(host) for host in hosts]
         )
 
-        # Should contain stale indicator (with CSS class)
-        assert "stale-host" in result
-        assert "stale" in result.lower()
+        assert summary == ReportSummary(
+            hosts_with_updates=2,
+            hosts_with_security_updates=1,
+            total_updates=3,
+            total_security_updates=1,
+        )
+
+    def test_from_host_updates_empty(self):
+        """Test that an empty host list yields zeroed counts."""
+        assert ReportSummary.from_host_updates([]) == ReportSummary(0, 0, 0, 0)
+
+
+@pytest.fixture(scope="module")
+def sample_hosts():
+    """Hosts with complete and minimal data, for schema validation."""
+    # Host with full data
+    host1 = Host(
+        name="complete-host",
+        ip="127.1.1.10",
+        description="Host with complete data",
+    )
+    host1.os = "linux"
+    host1.flavor = "ubuntu"
+    host1.version = "22.04"
+    host1.package_manager = "apt"
+    host1.last_refresh = _NOW
+    host1.supported = True
+    host1.online = True
+    host1.updates = [
+        Update(
+            name="curl",
+            current_version="7.81.0-1ubuntu1.4",
+            new_version="7.81.0-1ubuntu1.6",
+            security=True,
+            source="security",
+        ),
+        Update(
+            name="new-package",
+            current_version=None,  # New install - no current version
+            new_version="1.0.0",
+            security=False,
+            source="main",
+        ),
+    ]
+
+    # Host with minimal/undiscovered data
+    # Description field is expected to be elided
+    host2 = Host(name="minimal-host", ip="127.1.1.20")
+    host2.os = None
+    host2.flavor = None
+    host2.version = None
+    host2.package_manager = None
+    host2.last_refresh = None
+    host2.supported = True
+    host2.online = False
+    host2.updates = []
+
+    return [host1, host2]
+
+
+@pytest.fixture(scope="module")
+def validator():
+    """
+    Validator for the host report schema, built once.
+
+    The schema itself is checked once here, so an invalid schema still
+    fails the suite, and is not re-checked on every validation.
+    """
+    schema = get_host_report_schema()
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
 
 
 class TestJSONSchemaValidation:
     """Tests for JSON schema validation of report output."""
 
-    @pytest.fixture
-    def renderer(self):
-        return ReportRenderer()
-
-    @pytest.fixture
-    def sample_hosts(self):
-        # Host with full data
-        host1 = Host(
-            name="complete-host",
-            ip="127.1.1.10",
-            description="Host with complete data",
-        )
-        host1.os = "linux"
-        host1.flavor = "ubuntu"
-        host1.version = "22.04"
-        host1.package_manager = "apt"
-        host1.last_refresh = datetime.now(tz=timezone.utc)
-        host1.supported = True
-        host1.online = True
-        host1.updates = [
-            Update(
-                name="curl",
-                current_version="7.81.0-1ubuntu1.4",
-                new_version="7.81.0-1ubuntu1.6",
-                security=True,
-                source="security",
-            ),
-            Update(
-                name="new-package",
-                current_version=None,  # New install - no current version
-                new_version="1.0.0",
-                security=False,
-                source="main",
-            ),
-        ]
-
-        # Host with minimal/undiscovered data
-        # Description field is expected to be elided
-        host2 = Host(name="minimal-host", ip="127.1.1.20")
-        host2.os = None
-        host2.flavor = None
-        host2.version = None
-        host2.package_manager = None
-        host2.last_refresh = None
-        host2.supported = True
-        host2.online = False
-        host2.updates = []
-
-        return [host1, host2]
-
     @pytest.mark.parametrize(
         "report_type",
         [ReportType.full, ReportType.updates_only, ReportType.security_only],
     )
     def test_json_output_validates_against_schema(
-        self, renderer, sample_hosts, report_type
+        self, renderer, validator, sample_hosts, report_type
     ):
         """Test that JSON output validates against our JSON schema."""
         json_output = renderer.render_json(sample_hosts, report_type)
 
         # Parse JSON and validate against schema
         data = json.loads(json_output)
-        schema = get_host_report_schema()
 
         # This should not raise any exceptions
-        jsonschema.validate(data, schema)
+        validator.validate(data)
 
-    def test_json_schema_empty_report(self, renderer):
+    def test_json_schema_empty_report(self, renderer, validator):
         """Test that an empty report validates against the schema."""
         empty_json = renderer.render_json([], ReportType.full)
         data = json.loads(empty_json)
-        schema = get_host_report_schema()
 
         # This should not raise any exceptions
-        jsonschema.validate(data, schema)
+        validator.validate(data)
 
         # Should be an empty array
         assert data == []
 
-    def test_json_schema_optional_fields(self, renderer):
+    def test_json_schema_optional_fields(self, renderer, validator):
         """
         Test schema validation with optional fields
 
         Optional fields should be elided when empty/None
         and present when populated.
         """
-        schema = get_host_report_schema()
-
         host_with_desc = Host("test1", "1.1.1.1", description="Test host")
-        host_with_desc.last_refresh = datetime.now(tz=timezone.utc)
+        host_with_desc.last_refresh = _NOW
 
         host_without_desc = Host("test2", "2.2.2.2")  # No description
-        host_without_desc.last_refresh = datetime.now(tz=timezone.utc)
+        host_without_desc.last_refresh = _NOW
 
         json_output = renderer.render_json(
             [host_with_desc, host_without_desc], ReportType.full
         )
         data = json.loads(json_output)
-        jsonschema.validate(data, schema)
+        validator.validate(data)
 
         assert "description" in data[0]
         assert "description" not in data[1]